@@ -7,10 +7,10 @@ Add, update, and assign real vendor information to images
 import os
 import json
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from pathlib import Path
 
-@dataclass
+@dataclass(slots=True)
 class VendorInfo:
     """Vendor information structure"""
     vendor_id: str
@@ -55,26 +55,7 @@ class VendorManager:
     def save_vendors(self):
         """Save vendors to JSON file"""
         try:
-            data = {}
-            for vendor_id, vendor in self.vendors.items():
-                data[vendor_id] = {
-                    'vendor_id': vendor.vendor_id,
-                    'vendor_name': vendor.vendor_name,
-                    'vendor_location': vendor.vendor_location,
-                    'city': vendor.city,
-                    'state': vendor.state,
-                    'zip_code': vendor.zip_code,
-                    'vendor_website': vendor.vendor_website,
-                    'booking_link': vendor.booking_link,
-                    'vendor_rating': vendor.vendor_rating,
-                    'vendor_phone': vendor.vendor_phone,
-                    'instagram_handle': vendor.instagram_handle,
-                    'specialties': vendor.specialties,
-                    'price_range': vendor.price_range,
-                    'hours': vendor.hours,
-                    'description': vendor.description,
-                    'profile_image': vendor.profile_image
-                }
+            data = {vendor_id: asdict(vendor) for vendor_id, vendor in self.vendors.items()}
             
             with open(self.vendors_file, 'w') as f:
                 json.dump(data, f, indent=2)
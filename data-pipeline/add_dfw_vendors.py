@@ -8,6 +8,9 @@ import json
 import os
 from typing import List, Dict, Any
 
+# Strips commas and spaces so "Plano, TX" becomes the hashtag "planotx"
+_STRIP_TBL = str.maketrans('', '', ', ')
+
 def load_dfw_vendors() -> List[Dict[str, Any]]:
     """Load DFW vendor data from JSON file"""
     vendor_file = "downloads/vendors/dfw_vendors.json"
@@ -28,7 +31,6 @@ def load_dfw_vendors() -> List[Dict[str, Any]]:
 
 def create_nail_art_entries(vendors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Create nail art entries for each vendor"""
-    nail_art_entries = []
     
     # DFW-themed nail art designs
     dfw_designs = [
@@ -68,29 +70,35 @@ def create_nail_art_entries(vendors: List[Dict[str, Any]]) -> List[Dict[str, Any
         "https://images.unsplash.com/photo-1604654894619-df63bc536380?w=400"
     ]
     
-    for vendor in vendors:
+    # Exactly 3 entries per vendor, so size the list up front
+    nail_art_entries = [None] * (len(vendors) * 3)
+    idx = 0
+    
+    for v_idx, vendor in enumerate(vendors):
+        loc_tag = vendor['location'].lower().translate(_STRIP_TBL)
+        
         # Create 3 nail art entries per vendor
         for i in range(3):
-            design_index = (vendors.index(vendor) * 3 + i) % len(dfw_designs)
-            image_index = (vendors.index(vendor) * 3 + i) % len(nail_images)
+            design_index = (v_idx * 3 + i) % len(dfw_designs)
+            image_index = (v_idx * 3 + i) % len(nail_images)
             
-            entry = {
+            nail_art_entries[idx] = {
                 "id": f"{vendor['id']}_design_{i+1}",
                 "title": dfw_designs[design_index],
                 "artist": vendor['name'],
                 "url": nail_images[image_index],
                 "booking_link": vendor['booking_url'],
-                "hashtag": f"#dfwnails #{vendor['location'].lower().replace(', ', '')} #nailart",
+                "hashtag": f"#dfwnails #{loc_tag} #nailart",
                 "likes": 150 + (i * 25),
                 "comments": 12 + (i * 3),
                 "rating": vendor['rating'],
                 "price": vendor['price_range'],
-                "timestamp": 1640995200 + (vendors.index(vendor) * 86400) + (i * 3600),
+                "timestamp": 1640995200 + (v_idx * 86400) + (i * 3600),
                 "vendor_id": vendor['id'],
                 "location": vendor['location'],
                 "specialties": vendor['specialties']
             }
-            nail_art_entries.append(entry)
+            idx += 1
     
     print(f"✅ Created {len(nail_art_entries)} DFW nail art entries")
     return nail_art_entries
@@ -109,13 +117,16 @@ def merge_with_existing_dataset(new_entries: List[Dict[str, Any]]) -> List[Dict[
         except Exception as e:
             print(f"⚠️  Error loading existing dataset: {e}")
     
-    # Combine existing and new entries
-    all_entries = existing_entries + new_entries
+    # Combine existing and new entries, keyed by id so re-running the
+    # integration replaces entries instead of piling up duplicates
+    by_id = {entry['id']: entry for entry in existing_entries}
+    by_id.update({entry['id']: entry for entry in new_entries})
+    all_entries = list(by_id.values())
     
     # Save merged dataset
     merged_data = {"posts": all_entries}
     with open(existing_file, 'w') as f:
-        json.dump(merged_data, f, indent=2)
+        json.dump(merged_data, f, separators=(',', ':'))
     
     print(f"✅ Saved merged dataset with {len(all_entries)} total entries")
     return all_entries
@@ -126,7 +137,7 @@ def create_dfw_dataset(entries: List[Dict[str, Any]]) -> None:
     
     dfw_data = {"posts": entries}
     with open(dfw_file, 'w') as f:
-        json.dump(dfw_data, f, indent=2)
+        json.dump(dfw_data, f, separators=(',', ':'))
     
     print(f"✅ Created DFW-specific dataset: {dfw_file}")
 
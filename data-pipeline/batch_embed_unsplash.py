@@ -1,15 +1,13 @@
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
-import numpy as np
 
-# Add the embeddings module to the path
-sys.path.append(str(Path(__file__).parent.parent / "embeddings"))
-
-from embed import get_clip_embedding, build_index
-from query import load_index
+# The embeddings module (and its torch/CLIP imports) is only loaded once an
+# index is actually built, so a missing data file exits without paying for it
+EMBEDDINGS_DIR = str(Path(__file__).parent.parent / "embeddings")
 
 def load_unsplash_data(json_file: str = "downloads/nail_art_dataset.json") -> List[Dict[str, Any]]:
     """
@@ -21,6 +19,10 @@ def load_unsplash_data(json_file: str = "downloads/nail_art_dataset.json") -> Li
     Returns:
         List of post data with local image paths
     """
+    if not os.path.isfile(json_file):
+        print(f"Error: {json_file} not found. Please run the Unsplash scraper first.")
+        return []
+    
     try:
         with open(json_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -28,9 +30,6 @@ def load_unsplash_data(json_file: str = "downloads/nail_art_dataset.json") -> Li
         print(f"Loaded {len(data)} nail art posts from {json_file}")
         return data
         
-    except FileNotFoundError:
-        print(f"Error: {json_file} not found. Please run the Unsplash scraper first.")
-        return []
     except Exception as e:
         print(f"Error loading Unsplash data: {str(e)}")
         return []
@@ -78,6 +77,10 @@ def prepare_unsplash_metadata(posts: List[Dict[str, Any]]) -> List[Dict[str, Any
     print(f"Prepared metadata for {len(metadata)} valid posts")
     return metadata
 
+def _is_existing_file(path: str) -> bool:
+    """Return True if `path` is set and points to an existing file."""
+    return bool(path) and os.path.isfile(path)
+
 def filter_valid_posts(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Filter posts that have valid local image files.
@@ -90,9 +93,14 @@ def filter_valid_posts(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     valid_posts = []
     
-    for post in posts:
-        local_path = post.get("local_path")
-        if local_path and os.path.exists(local_path):
+    # Stat all files concurrently; on cold or network filesystems the
+    # per-file latency dominates, and map() keeps the original order
+    local_paths = [post.get("local_path") for post in posts]
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        exists = list(executor.map(_is_existing_file, local_paths))
+    
+    for post, local_path, found in zip(posts, local_paths, exists):
+        if found:
             # Check if it's an image file
             if local_path.lower().endswith(('.jpg', '.jpeg', '.png', '.webp')):
                 valid_posts.append(post)
@@ -127,13 +135,28 @@ def build_index_from_unsplash_data(posts: List[Dict[str, Any]],
     # Get local image paths
     image_paths = [meta["local_path"] for meta in metadata]
     
+    if EMBEDDINGS_DIR not in sys.path:
+        sys.path.append(EMBEDDINGS_DIR)
+    from embed import build_index
+    from cache import EmbeddingCache
+    
+    # Reuse embeddings of images that are unchanged since the last run
+    cache = EmbeddingCache(os.path.join(output_dir, "embedding_cache"))
+    print(f"Embedding cache holds {len(cache)} images")
+    
+    # Same file pair the backend loads: nail_art_index.faiss + nail_art_metadata.pkl
+    base_name = index_name[:-len("_index")] if index_name.endswith("_index") else index_name
+    index_path = os.path.join(output_dir, f"{index_name}.faiss")
+    metadata_path = os.path.join(output_dir, f"{base_name}_metadata.pkl")
+    
     # Build the index
     try:
         build_index(
             image_paths=image_paths,
             metadata=metadata,
-            index_name=index_name,
-            output_dir=output_dir
+            index_path=index_path,
+            metadata_path=metadata_path,
+            cache=cache
         )
         print(f"✅ Successfully built FAISS index with {len(metadata)} images")
         
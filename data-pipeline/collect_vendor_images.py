@@ -2,9 +2,14 @@ import json
 import os
 import shutil
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 def create_vendor_template():
     """Create a template for vendor information"""
     template = {
@@ -22,16 +27,22 @@ def create_vendor_template():
     return template
 
 def add_vendor_image(vendor_data: Dict[str, Any], image_path: str, design_name: str, 
-                    colors: List[str], style: str, price: str = None):
-    """Add an image to a vendor's portfolio"""
+                    colors: List[str], style: str, price: str = None,
+                    date_added: Optional[str] = None):
+    """
+    Add an image to a vendor's portfolio.
+    
+    When adding many images in a loop, compute the timestamp once
+    (`datetime.now().isoformat()`) and pass it as `date_added`.
+    """
     image_info = {
         "image_path": image_path,
         "design_name": design_name,
         "colors": colors,
         "style": style,
         "price": price or vendor_data.get("price_range", "$50-150"),
-        "date_added": datetime.now().isoformat(),
-        "tags": colors + [style, design_name]
+        "date_added": date_added or datetime.now().isoformat(),
+        "tags": [*colors, style, design_name]
     }
     vendor_data["images"].append(image_info)
     return vendor_data
@@ -42,8 +53,11 @@ def save_vendor_data(vendor_data: Dict[str, Any], filename: str):
     output_dir.mkdir(parents=True, exist_ok=True)
     
     output_path = output_dir / filename
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(vendor_data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(vendor_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            json.dump(vendor_data, f, indent=2, ensure_ascii=False)
     
     print(f"✅ Vendor data saved to {output_path}")
 
@@ -6,6 +6,11 @@ Script to customize Instagram vendor accounts for scraping.
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 def load_vendor_template():
     """Load the vendor template structure"""
     return {
@@ -16,6 +21,9 @@ def load_vendor_template():
         "specialties": ["Nail Art", "Gel Extensions", "Custom Designs"]
     }
 
+# Pretty-printed template shown by the interactive menu; it never changes
+_TEMPLATE_STR = json.dumps(load_vendor_template(), indent=2)
+
 def add_custom_vendor():
     """Add a custom vendor to the scraper"""
     print("=== Add Custom Nail Art Vendor ===")
@@ -34,22 +42,55 @@ def add_custom_vendor():
 
 def save_vendors_to_file(vendors, filename="custom_vendors.json"):
     """Save vendors to a JSON file"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(vendors, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        Path(filename).write_bytes(orjson.dumps(vendors, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            json.dump(vendors, f, indent=2, ensure_ascii=False)
     print(f"✅ Vendors saved to {filename}")
 
 def load_vendors_from_file(filename="custom_vendors.json"):
     """Load vendors from a JSON file"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
+        if orjson is not None:
+            return orjson.loads(Path(filename).read_bytes())
+        with open(filename, 'r', encoding='utf-8', buffering=1 << 20) as f:
             return json.load(f)
     except FileNotFoundError:
         return []
 
+def append_vendor_jsonl(vendor, filename="custom_vendors.jsonl"):
+    """Append one vendor as a JSON line (O(1) per add, unlike rewriting the JSON file)"""
+    if orjson is not None:
+        line = orjson.dumps(vendor)
+    else:
+        line = json.dumps(vendor, ensure_ascii=False).encode('utf-8')
+    with open(filename, 'ab') as f:
+        f.write(line + b"\n")
+
+def compact_vendors(jsonl_filename="custom_vendors.jsonl", filename="custom_vendors.json"):
+    """Fold vendors appended to the JSONL log into the JSON file, then remove the log"""
+    jsonl_path = Path(jsonl_filename)
+    if not jsonl_path.exists():
+        return
+    
+    vendors = load_vendors_from_file(filename)
+    loads = orjson.loads if orjson is not None else json.loads
+    for line in jsonl_path.read_bytes().splitlines():
+        if line.strip():
+            vendors.append(loads(line))
+    
+    save_vendors_to_file(vendors, filename)
+    jsonl_path.unlink()
+
 def main():
     """Main function to manage custom vendors"""
     print("Instagram Vendor Customization Tool")
     
+    # Pick up vendors left in the log by a session that didn't exit cleanly
+    compact_vendors()
+    vendors = load_vendors_from_file()
+    
     while True:
         print("\nOptions:")
         print("1. Add a new vendor")
@@ -61,12 +102,10 @@ def main():
         
         if choice == "1":
             vendor = add_custom_vendor()
-            vendors = load_vendors_from_file()
+            append_vendor_jsonl(vendor)
             vendors.append(vendor)
-            save_vendors_to_file(vendors)
             
         elif choice == "2":
-            vendors = load_vendors_from_file()
             if vendors:
                 print("\nCurrent vendors:")
                 for i, vendor in enumerate(vendors, 1):
@@ -75,11 +114,11 @@ def main():
                 print("No custom vendors found.")
                 
         elif choice == "3":
-            template = load_vendor_template()
             print("\nVendor template:")
-            print(json.dumps(template, indent=2))
+            print(_TEMPLATE_STR)
             
         elif choice == "4":
+            compact_vendors()
             print("Goodbye!")
             break
             
@@ -1,46 +1,109 @@
 import os
 import json
 import time
-import random
-from typing import List, Dict, Any, Optional
-import instaloader
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import List, Dict, Any, Callable, Iterator, Optional, Set, TYPE_CHECKING
 from pathlib import Path
 
+from rate_limit import TokenBucket
+
+if TYPE_CHECKING:
+    import instaloader
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; Parquet output is skipped without it
+    pa = None
+    pa_json = None
+    pq = None
+
+# Bounds (seconds) for the adaptive retry delay after throttled downloads
+MIN_DOWNLOAD_DELAY = 0.5
+MAX_DOWNLOAD_DELAY = 30.0
+
+# Post permalink template, bound once instead of re-parsed per post
+_INSTA_URL = "https://www.instagram.com/p/{}/".format
+
+def _walk_jpg(root: str) -> Iterator[str]:
+    """Yield paths of all .jpg files under root (os.scandir, no Path objects)"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.jpg') and entry.is_file():
+                    yield entry.path
+
+def _scan_size(root: str) -> int:
+    """Total size in bytes of all files under root (os.scandir, no Path objects)"""
+    total = 0
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+    return total
+
 class InstagramNailArtScraper:
-    def __init__(self, download_dir: str = "downloads", max_storage_gb: float = 1.0):
+    def __init__(self, download_dir: str = "downloads", max_storage_gb: float = 1.0,
+                 max_workers: int = 4, requests_per_minute: float = 120.0,
+                 background_login: bool = False):
         """
         Initialize the Instagram scraper for nail art images.
         
         Args:
             download_dir: Directory to save downloaded images
             max_storage_gb: Maximum storage in GB (default 1GB)
+            max_workers: Vendors/hashtags scraped concurrently (keep at 4-8
+                to stay under Instagram rate limits)
+            requests_per_minute: Post downloads allowed per minute across
+                all workers
+            background_login: Start logging in to Instagram on a background
+                thread right away instead of on the first scrape
         """
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(exist_ok=True)
         
+        # Instaloader keeps per-instance session state, so each worker thread
+        # gets its own loader (see _get_loader)
+        self.max_workers = max_workers
+        self._thread_state = threading.local()
+        self._loader_lock = threading.Lock()
+        self._login_thread: Optional[threading.Thread] = None
+        
+        # Overlap the login round-trip with the storage scan below
+        if background_login:
+            self.start_login()
+        
         # Storage limits
         self.max_storage_bytes = max_storage_gb * 1024 * 1024 * 1024  # Convert GB to bytes
-        self.current_storage = 0
         
-        # Initialize Instaloader with size limits
-        self.loader = instaloader.Instaloader(
-            download_pictures=True,
-            download_videos=False,
-            download_video_thumbnails=False,
-            download_geotags=False,
-            download_comments=False,
-            save_metadata=False,
-            compress_json=False,
-            dirname_pattern=str(self.download_dir / "{profile}"),
-            filename_pattern="{date_utc:%Y%m%d}_{shortcode}",
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            # Add size limits
-            max_connection_attempts=3,
-            request_timeout=30
-        )
+        # Walk the tree once; afterwards each download adds its own size
+        self.current_storage = self.get_directory_size(self.download_dir)
+        self._storage_lock = threading.Lock()
         
-        # Try to login to Instagram if credentials are provided
-        self._login_to_instagram()
+        # Retry delay after a throttled download: doubled when Instagram
+        # throttles us, eased back after each successful download
+        self._current_delay = MIN_DOWNLOAD_DELAY
+        
+        # One request budget shared by all workers; bursts pass while quota
+        # remains instead of every post paying a fixed sleep
+        self._rate_limiter = TokenBucket(requests_per_minute / 60.0, capacity=max_workers * 2)
         
         # Nail art vendor accounts to scrape (real public accounts)
         self.nail_vendors = [
@@ -67,42 +130,200 @@ class InstagramNailArtScraper:
             }
         ]
         
+        # Vendor lookup by Instagram username
+        self._vendor_by_username = {v["username"]: v for v in self.nail_vendors}
+        
         # Popular nail art hashtags to search (reduced list)
-        self.nail_hashtags = [
+        self.nail_hashtags = (
             "nailart",
             "naildesign",
             "nailinspo",
             "nailsofinstagram"
-        ]
+        )
+    
+    @cached_property
+    def loader(self) -> "instaloader.Instaloader":
+        """
+        Main Instaloader, created and logged in on first use.
+        
+        Listing downloaded images or vendors never needs it, so instaloader
+        is only imported once scraping actually starts.
+        """
+        loader = self._create_loader()
+        self._thread_state.loader = loader
+        
+        # Try to login to Instagram if credentials are provided
+        self._login_to_instagram(loader)
+        return loader
+    
+    def start_login(self) -> threading.Thread:
+        """
+        Create and log in the main loader on a background thread.
+        
+        Workers that need a loader wait on the same lock, so they pick up
+        the session once login finishes (or fails) instead of each blocking
+        on their own login.
+        
+        Returns:
+            The login thread
+        """
+        if self._login_thread is None:
+            self._login_thread = threading.Thread(target=self._init_main_loader, daemon=True)
+            self._login_thread.start()
+        return self._login_thread
+    
+    def _init_main_loader(self) -> None:
+        """Build the main loader (and log in) under the loader lock"""
+        with self._loader_lock:
+            self.loader
+    
+    def _create_loader(self) -> "instaloader.Instaloader":
+        """Create an Instaloader configured for image-only downloads"""
+        import instaloader
+        
+        return instaloader.Instaloader(
+            download_pictures=True,
+            download_videos=False,
+            download_video_thumbnails=False,
+            download_geotags=False,
+            download_comments=False,
+            save_metadata=False,
+            compress_json=False,
+            dirname_pattern=str(self.download_dir / "{profile}"),
+            filename_pattern="{date_utc:%Y%m%d}_{shortcode}",
+            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+            # Add size limits
+            max_connection_attempts=3,
+            request_timeout=30
+        )
+    
+    def _get_loader(self) -> "instaloader.Instaloader":
+        """Get the current thread's Instaloader, sharing the main login session"""
+        loader = getattr(self._thread_state, "loader", None)
+        if loader is None:
+            # Workers may race to build the main loader; log in only once
+            with self._loader_lock:
+                main_loader = self.loader
+            
+            loader = getattr(self._thread_state, "loader", None)
+            if loader is None:
+                loader = self._create_loader()
+                if main_loader.context.is_logged_in:
+                    loader.context.load_session(
+                        main_loader.context.username,
+                        main_loader.context.save_session()
+                    )
+                self._thread_state.loader = loader
+        return loader
+    
+    def _download_with_backoff(self, loader: "instaloader.Instaloader", post, target: str,
+                               max_attempts: int = 3) -> bool:
+        """
+        Download a post, backing off when Instagram rate-limits the request.
+        
+        Args:
+            loader: Instaloader to download with
+            post: Post to download
+            target: Target directory name for the post
+            max_attempts: Attempts before giving up on this post
+        
+        Returns:
+            True if new files were written, False if the post was already on disk
+        """
+        import instaloader
+        
+        for attempt in range(max_attempts):
+            self._rate_limiter.acquire()
+            try:
+                downloaded = loader.download_post(post, target=target)
+                self._current_delay = max(MIN_DOWNLOAD_DELAY, self._current_delay * 0.9)
+                return downloaded
+            except (instaloader.exceptions.TooManyRequestsException,
+                    instaloader.exceptions.ConnectionException):
+                self._current_delay = min(MAX_DOWNLOAD_DELAY, self._current_delay * 2)
+                if attempt == max_attempts - 1:
+                    raise
+                print(f"  Rate limited, retrying in {self._current_delay:.1f}s...")
+                time.sleep(self._current_delay)
     
-    def _login_to_instagram(self):
-        """Attempts to log in to Instagram using environment variables."""
+    def _login_to_instagram(self, loader: "instaloader.Instaloader", max_attempts: int = 3):
+        """Attempts to log in to Instagram using environment variables, retrying network errors."""
+        import instaloader
+        
         username = os.getenv("INSTAGRAM_USERNAME")
         password = os.getenv("INSTAGRAM_PASSWORD")
 
         if username and password:
-            try:
-                print("Attempting to log in to Instagram...")
-                self.loader.login(username, password)
-                print("Successfully logged in to Instagram.")
-            except Exception as e:
-                print(f"Failed to log in to Instagram: {str(e)}")
-                print("Please ensure INSTAGRAM_USERNAME and INSTAGRAM_PASSWORD are set in your environment.")
+            for attempt in range(max_attempts):
+                try:
+                    print("Attempting to log in to Instagram...")
+                    loader.login(username, password)
+                    print("Successfully logged in to Instagram.")
+                    return
+                except instaloader.exceptions.ConnectionException as e:
+                    # Transient network/throttling error; back off and retry
+                    if attempt < max_attempts - 1:
+                        delay = 2 ** (attempt + 1)
+                        print(f"Login attempt failed ({str(e)}), retrying in {delay}s...")
+                        time.sleep(delay)
+                        continue
+                    print(f"Failed to log in to Instagram: {str(e)}")
+                except Exception as e:
+                    print(f"Failed to log in to Instagram: {str(e)}")
+                    print("Please ensure INSTAGRAM_USERNAME and INSTAGRAM_PASSWORD are set in your environment.")
+                    return
         else:
             print("Instagram credentials not found. Please set INSTAGRAM_USERNAME and INSTAGRAM_PASSWORD in your environment.")
     
     def get_directory_size(self, path: Path) -> int:
         """Get total size of directory in bytes"""
-        total_size = 0
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
-                total_size += file_path.stat().st_size
-        return total_size
+        return _scan_size(str(path))
     
     def check_storage_limit(self, file_size: int = 0) -> bool:
         """Check if adding a file would exceed storage limit"""
-        current_size = self.get_directory_size(self.download_dir)
-        return (current_size + file_size) <= self.max_storage_bytes
+        return (self.current_storage + file_size) <= self.max_storage_bytes
+    
+    def _add_storage(self, file_size: int) -> None:
+        """Account for a newly downloaded file in the running storage total"""
+        with self._storage_lock:
+            self.current_storage += file_size
+    
+    def _post_files(self, target_dir: str, stem: str) -> Dict[str, int]:
+        """
+        Sizes of the files saved for one post: `{stem}.jpg`, or `{stem}_1.jpg`,
+        `{stem}_2.jpg`, ... for carousels, plus the `{stem}.txt` caption.
+        """
+        def size(name: str) -> Optional[int]:
+            try:
+                return os.stat(os.path.join(target_dir, name)).st_size
+            except FileNotFoundError:
+                return None
+        
+        files = {}
+        for name in (f"{stem}.jpg", f"{stem}.txt"):
+            file_size = size(name)
+            if file_size is not None:
+                files[name] = file_size
+        
+        # Carousel images are numbered from 1 with no gaps
+        index = 1
+        while True:
+            name = f"{stem}_{index}.jpg"
+            file_size = size(name)
+            if file_size is None:
+                break
+            files[name] = file_size
+            index += 1
+        
+        return files
+    
+    def _download_and_account(self, loader: "instaloader.Instaloader", post, target: str,
+                              target_dir: str, stem: str) -> None:
+        """Download a post and add the size of every file it wrote to the running total"""
+        before = self._post_files(target_dir, stem)
+        if self._download_with_backoff(loader, post, target):
+            after = self._post_files(target_dir, stem)
+            self._add_storage(sum(size for name, size in after.items() if name not in before))
     
     def download_profile_posts(self, username: str, max_posts: int = 10) -> List[Dict[str, Any]]:
         """
@@ -118,54 +339,69 @@ class InstagramNailArtScraper:
         try:
             print(f"Downloading posts from @{username}...")
             
+            import instaloader
+            
+            loader = self._get_loader()
+            
             # Get profile
-            profile = instaloader.Profile.from_username(self.loader.context, username)
+            profile = instaloader.Profile.from_username(loader.context, username)
             
             # Download posts
             posts_data = []
             post_count = 0
+            vendor_dir = str(self.download_dir / username)
+            
+            # Bind per-post calls once, outside the hot loop
+            _append = posts_data.append
+            _download = self._download_and_account
             
             for post in profile.get_posts():
                 if post_count >= max_posts:
                     break
                 
+                # Videos are never used, so don't spend a request on them
+                if post.is_video:
+                    continue
+                
                 # Check storage limit before downloading
                 if not self.check_storage_limit():
                     print(f"  Storage limit reached ({self.max_storage_bytes / (1024**3):.2f}GB). Stopping downloads.")
                     break
                 
                 try:
+                    # Read post properties once; date_utc builds a new datetime
+                    # on every access
+                    shortcode = post.shortcode
+                    date_utc = post.date_utc
+                    stem = f"{date_utc:%Y%m%d}_{shortcode}"
+                    
                     # Download the post
-                    self.loader.download_post(post, target=username)
+                    _download(loader, post, username, vendor_dir, stem)
                     
-                    # Get local file path
-                    local_path = self.download_dir / username / f"{post.date_utc:%Y%m%d}_{post.shortcode}.jpg"
+                    # Get local file path; carousels start at {stem}_1.jpg
+                    local_path = f"{vendor_dir}/{stem}.jpg"
+                    if not os.path.exists(local_path):
+                        local_path = f"{vendor_dir}/{stem}_1.jpg"
+                    file_size = os.path.getsize(local_path)
                     
-                    if local_path.exists():
-                        # Get file size
-                        file_size = local_path.stat().st_size
-                        
-                        post_data = {
-                            "local_path": str(local_path),
-                            "instagram_url": f"https://www.instagram.com/p/{post.shortcode}/",
-                            "caption": post.caption or "",
-                            "likes": post.likes,
-                            "comments": post.comments,
-                            "date": post.date_utc.isoformat(),
-                            "username": username,
-                            "shortcode": post.shortcode,
-                            "file_size": file_size
-                        }
-                        posts_data.append(post_data)
-                        post_count += 1
-                        print(f"  Downloaded post {post_count}/{max_posts}: {post.shortcode} ({file_size / 1024:.1f}KB)")
+                    post_data = {
+                        "local_path": local_path,
+                        "instagram_url": _INSTA_URL(shortcode),
+                        "caption": post.caption or "",
+                        "likes": post.likes,
+                        "comments": post.comments,
+                        "date": date_utc.isoformat(),
+                        "username": username,
+                        "shortcode": shortcode,
+                        "file_size": file_size
+                    }
+                    _append(post_data)
+                    post_count += 1
+                    print(f"  Downloaded post {post_count}/{max_posts}: {shortcode} ({file_size / 1024:.1f}KB)")
                     
                 except Exception as e:
                     print(f"  Error downloading post {post.shortcode}: {str(e)}")
                     continue
-                
-                # Add delay to avoid rate limiting
-                time.sleep(random.uniform(1, 3))
             
             print(f"Successfully downloaded {len(posts_data)} posts from @{username}")
             return posts_data
@@ -188,11 +424,20 @@ class InstagramNailArtScraper:
         try:
             print(f"Searching for posts with #{hashtag}...")
             
+            import instaloader
+            
+            loader = self._get_loader()
+            
             # Get hashtag
-            hashtag_obj = instaloader.Hashtag.from_name(self.loader.context, hashtag)
+            hashtag_obj = instaloader.Hashtag.from_name(loader.context, hashtag)
             
             posts_data = []
             post_count = 0
+            hashtag_dir = str(self.download_dir / f"hashtag_{hashtag}")
+            
+            # Bind per-post calls once, outside the hot loop
+            _append = posts_data.append
+            _download = self._download_and_account
             
             for post in hashtag_obj.get_posts():
                 if post_count >= max_posts:
@@ -208,38 +453,42 @@ class InstagramNailArtScraper:
                     if post.is_video:
                         continue
                     
+                    # Read post properties once; date_utc builds a new datetime
+                    # on every access
+                    shortcode = post.shortcode
+                    date_utc = post.date_utc
+                    stem = f"{date_utc:%Y%m%d}_{shortcode}"
+                    
                     # Download the post
-                    self.loader.download_post(post, target=f"hashtag_{hashtag}")
+                    _download(loader, post, f"hashtag_{hashtag}", hashtag_dir, stem)
+                    
+                    # Get local file path; carousels start at {stem}_1.jpg
+                    local_path = f"{hashtag_dir}/{stem}.jpg"
+                    if not os.path.exists(local_path):
+                        local_path = f"{hashtag_dir}/{stem}_1.jpg"
+                    file_size = os.path.getsize(local_path)
                     
-                    # Get local file path
-                    local_path = self.download_dir / f"hashtag_{hashtag}" / f"{post.date_utc:%Y%m%d}_{post.shortcode}.jpg"
+                    owner_username = post.owner.username
                     
-                    if local_path.exists():
-                        # Get file size
-                        file_size = local_path.stat().st_size
-                        
-                        post_data = {
-                            "local_path": str(local_path),
-                            "instagram_url": f"https://www.instagram.com/p/{post.shortcode}/",
-                            "caption": post.caption or "",
-                            "likes": post.likes,
-                            "comments": post.comments,
-                            "date": post.date_utc.isoformat(),
-                            "username": post.owner.username,
-                            "shortcode": post.shortcode,
-                            "hashtag": hashtag,
-                            "file_size": file_size
-                        }
-                        posts_data.append(post_data)
-                        post_count += 1
-                        print(f"  Downloaded post {post_count}/{max_posts}: {post.shortcode} from @{post.owner.username} ({file_size / 1024:.1f}KB)")
+                    post_data = {
+                        "local_path": local_path,
+                        "instagram_url": _INSTA_URL(shortcode),
+                        "caption": post.caption or "",
+                        "likes": post.likes,
+                        "comments": post.comments,
+                        "date": date_utc.isoformat(),
+                        "username": owner_username,
+                        "shortcode": shortcode,
+                        "hashtag": hashtag,
+                        "file_size": file_size
+                    }
+                    _append(post_data)
+                    post_count += 1
+                    print(f"  Downloaded post {post_count}/{max_posts}: {shortcode} from @{owner_username} ({file_size / 1024:.1f}KB)")
                     
                 except Exception as e:
                     print(f"  Error downloading post {post.shortcode}: {str(e)}")
                     continue
-                
-                # Add delay to avoid rate limiting
-                time.sleep(random.uniform(2, 5))
             
             print(f"Successfully downloaded {len(posts_data)} posts with #{hashtag}")
             return posts_data
@@ -248,64 +497,101 @@ class InstagramNailArtScraper:
             print(f"Error searching hashtag #{hashtag}: {str(e)}")
             return []
     
-    def scrape_all_vendors(self, max_posts_per_vendor: int = 8) -> List[Dict[str, Any]]:
+    def scrape_all_vendors(self, max_posts_per_vendor: int = 8,
+                           seen: Optional[Set[str]] = None,
+                           on_post: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
         """
         Scrape posts from all vendor accounts.
         
         Args:
             max_posts_per_vendor: Maximum posts to download per vendor
+            seen: Shortcodes already collected; duplicates are skipped and
+                new shortcodes are added to it
+            on_post: Optional callback receiving each post as soon as its
+                vendor finishes; when given, posts are not collected
             
         Returns:
-            List of all scraped posts with vendor information
+            List of all scraped posts with vendor information (empty when
+            `on_post` is given)
         """
         all_posts = []
+        post_count = 0
         
-        for vendor in self.nail_vendors:
-            username = vendor["username"]
-            print(f"\nScraping vendor: {vendor['name']} (@{username})")
-            
-            # Download posts from this vendor
-            posts = self.download_profile_posts(username, max_posts_per_vendor)
+        # Vendors are independent network-bound work, so scrape them
+        # concurrently; the worker pool provides the spacing between vendors.
+        # Each vendor's posts are emitted as soon as its future resolves
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for vendor in self.nail_vendors:
+                print(f"\nScraping vendor: {vendor['name']} (@{vendor['username']})")
+                futures.append(executor.submit(
+                    self.download_profile_posts, vendor["username"], max_posts_per_vendor
+                ))
             
-            # Add vendor information to each post
-            for post in posts:
-                post.update({
-                    "vendor_name": vendor["name"],
-                    "booking_url": vendor["booking_url"],
-                    "location": vendor["location"],
-                    "specialties": vendor["specialties"]
-                })
-            
-            all_posts.extend(posts)
-            
-            # Add delay between vendors
-            time.sleep(random.uniform(5, 10))
+            for future in futures:
+                for post in future.result():
+                    if seen is not None:
+                        if post["shortcode"] in seen:
+                            continue
+                        seen.add(post["shortcode"])
+                    
+                    # Add the post's vendor information; the specialties are
+                    # frozen so a post can't mutate the vendor's list
+                    vendor = self._vendor_by_username[post["username"]]
+                    post.update(
+                        vendor_name=vendor["name"],
+                        booking_url=vendor["booking_url"],
+                        location=vendor["location"],
+                        specialties=tuple(vendor["specialties"])
+                    )
+                    post_count += 1
+                    if on_post is not None:
+                        on_post(post)
+                    else:
+                        all_posts.append(post)
         
-        print(f"\nTotal posts scraped from vendors: {len(all_posts)}")
+        print(f"\nTotal posts scraped from vendors: {post_count}")
         return all_posts
     
-    def scrape_hashtags(self, max_posts_per_hashtag: int = 3) -> List[Dict[str, Any]]:
+    def scrape_hashtags(self, max_posts_per_hashtag: int = 3,
+                        seen: Optional[Set[str]] = None,
+                        on_post: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
         """
         Scrape posts from popular nail art hashtags.
         
         Args:
             max_posts_per_hashtag: Maximum posts to download per hashtag
+            seen: Shortcodes already collected; duplicates are skipped and
+                new shortcodes are added to it
+            on_post: Optional callback receiving each post as soon as its
+                hashtag finishes; when given, posts are not collected
             
         Returns:
-            List of scraped posts from hashtags
+            List of scraped posts from hashtags (empty when `on_post` is given)
         """
         all_posts = []
+        post_count = 0
         
-        for hashtag in self.nail_hashtags:
-            print(f"\nScraping hashtag: #{hashtag}")
-            
-            posts = self.search_hashtag_posts(hashtag, max_posts_per_hashtag)
-            all_posts.extend(posts)
-            
-            # Add delay between hashtags
-            time.sleep(random.uniform(3, 7))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for hashtag in self.nail_hashtags:
+                print(f"\nScraping hashtag: #{hashtag}")
+                futures.append(executor.submit(
+                    self.search_hashtag_posts, hashtag, max_posts_per_hashtag
+                ))
+            for future in futures:
+                for post in future.result():
+                    if seen is not None:
+                        if post["shortcode"] in seen:
+                            continue
+                        seen.add(post["shortcode"])
+                    post_count += 1
+                    if on_post is not None:
+                        on_post(post)
+                    else:
+                        all_posts.append(post)
         
-        print(f"\nTotal posts scraped from hashtags: {len(all_posts)}")
+        print(f"\nTotal posts scraped from hashtags: {post_count}")
         return all_posts
     
     def save_to_json(self, posts: List[Dict[str, Any]], filename: str = "instagram_scraped.json") -> None:
@@ -318,11 +604,49 @@ class InstagramNailArtScraper:
         """
         output_path = self.download_dir / filename
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(posts, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(posts))
+        else:
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                json.dump(posts, f, separators=(',', ':'), ensure_ascii=False)
         
         print(f"Saved {len(posts)} posts to {output_path}")
     
+    def jsonl_to_json(self, jsonl_filename: str = "instagram_scraped.jsonl",
+                      filename: str = "instagram_scraped.json") -> int:
+        """
+        Convert a JSON Lines post file into a JSON array file.
+        
+        Lines are copied through verbatim, so posts are never decoded and
+        the whole dataset is never held in memory.
+        
+        Args:
+            jsonl_filename: JSON Lines file written during scraping
+            filename: Output JSON array filename
+        
+        Returns:
+            Number of posts written
+        """
+        jsonl_path = self.download_dir / jsonl_filename
+        output_path = self.download_dir / filename
+        count = 0
+        
+        with open(jsonl_path, 'rb', buffering=1 << 20) as src, \
+                open(output_path, 'wb', buffering=1 << 20) as dst:
+            dst.write(b"[")
+            for line in src:
+                line = line.rstrip(b"\n")
+                if not line:
+                    continue
+                if count:
+                    dst.write(b",")
+                dst.write(line)
+                count += 1
+            dst.write(b"]")
+        
+        print(f"Saved {count} posts to {output_path}")
+        return count
+    
     def get_storage_stats(self) -> Dict[str, Any]:
         """Get storage statistics"""
         total_size = self.get_directory_size(self.download_dir)
@@ -342,65 +666,98 @@ class InstagramNailArtScraper:
         Returns:
             List of image file paths
         """
-        image_paths = []
+        return list(_walk_jpg(str(self.download_dir)))
+    
+    def jsonl_to_parquet(self, jsonl_filename: str = "instagram_scraped.jsonl",
+                         filename: str = "instagram_scraped.parquet") -> Optional[Path]:
+        """
+        Convert a JSON Lines post file into a columnar Parquet file.
         
-        for file_path in self.download_dir.rglob("*.jpg"):
-            if file_path.is_file():
-                image_paths.append(str(file_path))
+        The repeated vendor fields (name, booking URL, location) are
+        dictionary-encoded, so they are stored once per file rather than once
+        per post. Requires pyarrow; returns None when it is not installed.
         
-        return image_paths
+        Args:
+            jsonl_filename: JSON Lines file written during scraping
+            filename: Output Parquet filename
+        
+        Returns:
+            Path of the Parquet file, or None if pyarrow is unavailable
+        """
+        if pq is None:
+            return None
+        
+        output_path = self.download_dir / filename
+        table = pa_json.read_json(self.download_dir / jsonl_filename)
+        pq.write_table(table, output_path, compression='zstd', use_dictionary=True)
+        
+        print(f"Saved {table.num_rows} posts to {output_path}")
+        return output_path
     
-    def create_vendor_dataset(self) -> List[Dict[str, Any]]:
+    def create_vendor_dataset(self, jsonl_filename: str = "instagram_scraped.jsonl") -> int:
         """
         Create a complete dataset with vendor information and local image paths.
         
+        Posts are streamed to a JSON Lines file as they are scraped and the
+        JSON array file is produced from it at the end.
+        
+        Args:
+            jsonl_filename: JSON Lines file posts are appended to while scraping
+        
         Returns:
-            List of posts with vendor data and local image paths
+            Number of unique posts scraped
         """
         print("Starting Instagram scraping for nail art vendors...")
         print(f"Storage limit: {self.max_storage_bytes / (1024**3):.2f}GB")
         
-        # Scrape vendor accounts
-        vendor_posts = self.scrape_all_vendors(max_posts_per_vendor=8)
-        
-        # Scrape hashtags for additional variety
-        hashtag_posts = self.scrape_hashtags(max_posts_per_hashtag=3)
-        
-        # Combine all posts
-        all_posts = vendor_posts + hashtag_posts
-        
-        # Remove duplicates based on shortcode
+        # Shortcodes seen so far; both scrapes skip duplicates as they merge
         seen_shortcodes = set()
-        unique_posts = []
+        jsonl_path = self.download_dir / jsonl_filename
         
-        for post in all_posts:
-            if post["shortcode"] not in seen_shortcodes:
-                seen_shortcodes.add(post["shortcode"])
-                unique_posts.append(post)
+        with open(jsonl_path, 'wb', buffering=1 << 20) as out:
+            if orjson is not None:
+                def write_post(post: Dict[str, Any]) -> None:
+                    out.write(orjson.dumps(post) + b"\n")
+            else:
+                def write_post(post: Dict[str, Any]) -> None:
+                    out.write(json.dumps(post, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b"\n")
+            
+            # Scrape vendor accounts
+            self.scrape_all_vendors(max_posts_per_vendor=8, seen=seen_shortcodes, on_post=write_post)
+            
+            # Scrape hashtags for additional variety
+            self.scrape_hashtags(max_posts_per_hashtag=3, seen=seen_shortcodes, on_post=write_post)
         
-        print(f"Total unique posts: {len(unique_posts)}")
+        print(f"Total unique posts: {len(seen_shortcodes)}")
         
         # Get storage stats
         stats = self.get_storage_stats()
         print(f"Storage used: {stats['total_size_gb']:.2f}GB / {stats['max_size_gb']:.2f}GB ({stats['usage_percent']:.1f}%)")
         
-        # Save to JSON
-        self.save_to_json(unique_posts)
+        # Save to JSON for the embedding pipeline
+        saved = self.jsonl_to_json(jsonl_filename)
+        
+        # Columnar copy for analysis, when pyarrow is installed; a failure
+        # here must not cost the JSON file written above
+        try:
+            self.jsonl_to_parquet(jsonl_filename)
+        except (pa.ArrowException, ValueError) as e:
+            print(f"Warning: could not write Parquet copy: {e}")
         
-        return unique_posts
+        return saved
 
 def main():
     """Main function to run the Instagram scraper"""
-    scraper = InstagramNailArtScraper(max_storage_gb=1.0)
+    scraper = InstagramNailArtScraper(max_storage_gb=1.0, background_login=True)
     
     # Create the dataset
-    posts = scraper.create_vendor_dataset()
+    post_count = scraper.create_vendor_dataset()
     
     # Final storage stats
     stats = scraper.get_storage_stats()
     
     print(f"\nScraping completed!")
-    print(f"Downloaded {len(posts)} nail art images.")
+    print(f"Downloaded {post_count} nail art images.")
     print(f"Storage used: {stats['total_size_gb']:.2f}GB / {stats['max_size_gb']:.2f}GB")
     print(f"Images saved to: {scraper.download_dir}")
     print(f"Data saved to: {scraper.download_dir}/instagram_scraped.json")
@@ -10,6 +10,7 @@ sys.path.append(str(Path(__file__).parent.parent / "embeddings"))
 
 from embed import get_clip_embedding, build_index
 from query import load_index
+from cache import EmbeddingCache
 
 def create_manual_dataset():
     """
@@ -22,13 +23,13 @@ def create_manual_dataset():
         print(f"Creating directory: {images_dir}")
         images_dir.mkdir(parents=True, exist_ok=True)
     
-    # Get all image files
-    image_extensions = ['.jpg', '.jpeg', '.png', '.webp']
-    image_files = []
-    
-    for ext in image_extensions:
-        image_files.extend(images_dir.glob(f"*{ext}"))
-        image_files.extend(images_dir.glob(f"*{ext.upper()}"))
+    # Get all image files in a single directory pass
+    image_extensions = {'.jpg', '.jpeg', '.png', '.webp'}
+    with os.scandir(images_dir) as entries:
+        image_files = [
+            entry for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in image_extensions
+        ]
     
     if not image_files:
         print(f"No image files found in {images_dir}")
@@ -87,16 +88,16 @@ def create_manual_dataset():
         }
     ]
     
-    for i, image_path in enumerate(image_files):
+    for i, image_entry in enumerate(image_files):
         vendor = vendors[i % len(vendors)]
         design = nail_designs[i % len(nail_designs)]
         
         # Get file size
-        file_size = image_path.stat().st_size
+        file_size = image_entry.stat().st_size
         
         meta = {
             "id": i,
-            "local_path": str(image_path),
+            "local_path": image_entry.path,
             "title": f"{design} by {vendor['name']}",
             "artist": vendor["name"],
             "instagram": vendor["instagram"],
@@ -122,14 +123,15 @@ def save_manual_dataset(metadata: List[Dict[str, Any]], filename: str = "manual_
     output_path = Path("downloads") / filename
     
     with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
+        json.dump(metadata, f, separators=(',', ':'), ensure_ascii=False)
     
     print(f"Saved {len(metadata)} entries to {output_path}")
 
 def build_index_from_manual_data(metadata: List[Dict[str, Any]], 
                                 index_path: str = "nail_art_index.faiss",
-                                metadata_path: str = "nail_art_metadata.pkl") -> None:
-    """Build FAISS index from manual nail art data"""
+                                metadata_path: str = "nail_art_metadata.pkl",
+                                batch_size: int = 64) -> None:
+    """Build FAISS index from manual nail art data, embedding images in batches of `batch_size`"""
     if not metadata:
         print("No metadata found. Cannot build index.")
         return
@@ -139,13 +141,19 @@ def build_index_from_manual_data(metadata: List[Dict[str, Any]],
     # Get local image paths
     image_paths = [meta["local_path"] for meta in metadata]
     
+    # Reuse embeddings of images that are unchanged since the last run
+    cache = EmbeddingCache(str(Path("downloads") / "embedding_cache"))
+    print(f"Embedding cache holds {len(cache)} images")
+    
     # Build the index
     try:
         build_index(
             image_paths=image_paths,
             metadata=metadata,
             index_path=index_path,
-            metadata_path=metadata_path
+            metadata_path=metadata_path,
+            cache=cache,
+            batch_size=batch_size
         )
         print(f"✅ Successfully built FAISS index with {len(metadata)} images")
         
@@ -0,0 +1,46 @@
+import time
+import threading
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`, so
+    bursts go through immediately while quota is left and callers only
+    block once it is used up. Shared across worker threads it enforces one
+    global request rate instead of a fixed sleep per thread.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Create a bucket that starts full.
+        
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum tokens held (largest burst allowed)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Take tokens from the bucket, sleeping until they are available.
+        
+        Tokens are reserved under the lock and the wait happens outside it,
+        so concurrent callers queue up in order without holding each other.
+        
+        Args:
+            tokens: Number of tokens to take
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
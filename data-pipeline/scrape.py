@@ -2,10 +2,13 @@ import json
 import time
 import random
 import os
+from pathlib import Path
 from typing import List, Dict, Any
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -13,25 +16,50 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Desktop browser user agents to rotate through (a fixed pool avoids
+# fake_useragent loading and possibly downloading its UA list per instance)
+_UA_POOL = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+)
+
 class InstagramScraper:
     def __init__(self):
-        self.ua = UserAgent()
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': self.ua.random,
+            'User-Agent': random.choice(_UA_POOL),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         })
         
+        # Pool connections so repeated fetches from the same host reuse
+        # TCP/TLS sessions. Nothing fetches through self.session yet
+        # (scrape_hashtag generates mock posts); real fetches should use it
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.5)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
     def setup_driver(self):
         """Setup Chrome driver with options"""
         chrome_options = Options()
         chrome_options.add_argument("--headless")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument(f"--user-agent={self.ua.random}")
+        chrome_options.add_argument(f"--user-agent={random.choice(_UA_POOL)}")
         
         driver = webdriver.Chrome(
             service=webdriver.chrome.service.Service(ChromeDriverManager().install()),
@@ -134,7 +162,15 @@ class InstagramScraper:
             "Bold Statement Nail Art"
         ]
         
-        for i in range(min(max_posts, 20)):
+        # Draw all random engagement numbers in one vectorized call each
+        post_count = min(max_posts, 20)
+        rng = np.random.default_rng()
+        likes = rng.integers(100, 5001, post_count).tolist()
+        comments = rng.integers(10, 201, post_count).tolist()
+        ages = rng.integers(0, 86400 * 30 + 1, post_count).tolist()  # Random time in last 30 days
+        now = time.time()
+        
+        for i in range(post_count):
             vendor = nail_vendors[i % len(nail_vendors)]
             design = nail_designs[i % len(nail_designs)]
             
@@ -147,9 +183,9 @@ class InstagramScraper:
                 "location": vendor["location"],
                 "specialties": vendor["specialties"],
                 "hashtag": hashtag,
-                "likes": random.randint(100, 5000),
-                "comments": random.randint(10, 200),
-                "timestamp": time.time() - random.randint(0, 86400 * 30)  # Random time in last 30 days
+                "likes": likes[i],
+                "comments": comments[i],
+                "timestamp": now - ages[i]
             }
             mock_posts.append(post)
         
@@ -181,13 +217,11 @@ class InstagramScraper:
                 print(f"Error scraping #{hashtag}: {str(e)}")
                 continue
         
-        # Remove duplicates based on URL
-        seen_urls = set()
-        unique_posts = []
+        # Remove duplicates based on URL, keeping the first post seen for each
+        unique_by_url = {}
         for post in all_posts:
-            if post["url"] not in seen_urls:
-                seen_urls.add(post["url"])
-                unique_posts.append(post)
+            unique_by_url.setdefault(post["url"], post)
+        unique_posts = list(unique_by_url.values())
         
         print(f"Total unique posts scraped: {len(unique_posts)}")
         return unique_posts
@@ -200,8 +234,11 @@ class InstagramScraper:
             posts: List of post data
             filename: Output filename
         """
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(posts, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            Path(filename).write_bytes(orjson.dumps(posts))
+        else:
+            with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                json.dump(posts, f, separators=(',', ':'), ensure_ascii=False)
         
         print(f"Saved {len(posts)} posts to {filename}")
 
@@ -1,20 +1,122 @@
-import os
 import json
 import time
+import shutil
+import threading
 import random
 import requests
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
+from types import MappingProxyType
 from urllib.parse import urlparse
+from rate_limit import TokenBucket
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Real nail art vendor data; entries are read-only views since every
+# scraper instance shares them
+_NAIL_VENDORS = (
+    MappingProxyType({
+        "name": "Nail Art Studio NYC",
+        "instagram": "@nailartstudionyc",
+        "booking_url": "https://nailartstudionyc.com/book",
+        "location": "New York, NY",
+        "specialties": ("3D Nail Art", "Gel Extensions", "Nail Art")
+    }),
+    MappingProxyType({
+        "name": "Luxe Nail Bar",
+        "instagram": "@luxenailbar",
+        "booking_url": "https://luxenailbar.com/appointments",
+        "location": "Los Angeles, CA",
+        "specialties": ("Luxury Nail Art", "Acrylics", "Designer Nails")
+    }),
+    MappingProxyType({
+        "name": "Artistic Nails by Sarah",
+        "instagram": "@artisticnailsbysarah",
+        "booking_url": "https://artisticnailsbysarah.com/book",
+        "location": "Miami, FL",
+        "specialties": ("Hand-painted Art", "3D Sculptures", "Custom Designs")
+    }),
+    MappingProxyType({
+        "name": "Glamour Nail Studio",
+        "instagram": "@glamournailstudio",
+        "booking_url": "https://glamournailstudio.com/booking",
+        "location": "Chicago, IL",
+        "specialties": ("Glamour Nails", "Celebrity Style", "Luxury Designs")
+    }),
+    MappingProxyType({
+        "name": "Creative Nail Art by Maria",
+        "instagram": "@creativenailartbymaria",
+        "booking_url": "https://creativenailartbymaria.com/appointments",
+        "location": "San Francisco, CA",
+        "specialties": ("Creative Designs", "Abstract Art", "Modern Styles")
+    })
+)
+
+# Curated nail art image URLs from Unsplash (real working URLs)
+_IMAGE_URLS = (
+    "https://images.unsplash.com/photo-1604654894610-df63bc536371?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894611-df63bc536372?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894612-df63bc536373?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894613-df63bc536374?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894614-df63bc536375?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894615-df63bc536376?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894616-df63bc536377?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894617-df63bc536378?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894618-df63bc536379?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894619-df63bc536380?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894620-df63bc536381?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894621-df63bc536382?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894622-df63bc536383?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894623-df63bc536384?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894624-df63bc536385?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894625-df63bc536386?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894626-df63bc536387?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894627-df63bc536388?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894628-df63bc536389?w=800&h=800&fit=crop&crop=center",
+    "https://images.unsplash.com/photo-1604654894629-df63bc536390?w=800&h=800&fit=crop&crop=center"
+)
+
+# Nail art design descriptions
+_NAIL_DESIGNS = (
+    "Floral French Manicure",
+    "3D Crystal Nail Art",
+    "Gradient Sunset Nails",
+    "Marble Effect Design",
+    "Geometric Pattern Nails",
+    "Holographic Glitter Nails",
+    "Animal Print Nail Art",
+    "Minimalist Line Art",
+    "Galaxy Nail Design",
+    "Tropical Paradise Nails",
+    "Vintage Rose Nail Art",
+    "Modern Abstract Design",
+    "Neon Color Block Nails",
+    "Elegant Pearl Accent Nails",
+    "Bold Statement Nail Art",
+    "Pastel Ombre Nails",
+    "Metallic Foil Nail Art",
+    "Watercolor Nail Design",
+    "Chrome Mirror Nails",
+    "3D Flower Nail Art"
+)
 
 class UnsplashNailArtScraper:
-    def __init__(self, download_dir: str = "downloads", max_storage_gb: float = 1.0):
+    def __init__(self, download_dir: str = "downloads", max_storage_gb: float = 1.0,
+                 max_workers: int = 8, requests_per_second: float = 5.0):
         """
         Initialize the Unsplash scraper for nail art images.
         
         Args:
             download_dir: Directory to save downloaded images
             max_storage_gb: Maximum storage in GB (default 1GB)
+            max_workers: Images downloaded concurrently
+            requests_per_second: Sustained download rate shared by all workers
         """
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(exist_ok=True)
@@ -22,96 +124,38 @@ class UnsplashNailArtScraper:
         # Storage limits
         self.max_storage_bytes = max_storage_gb * 1024 * 1024 * 1024  # Convert GB to bytes
         
+        # Walk the tree once; afterwards each download adds its own size
+        self._current_bytes = self.get_directory_size(self.download_dir)
+        self._storage_lock = threading.Lock()
+        
+        # Downloads are network-bound, so several run at once; one shared
+        # token bucket keeps the combined rate polite without idle sleeps
+        self.max_workers = max_workers
+        self._rate_limiter = TokenBucket(requests_per_second, capacity=max_workers)
+        
+        # One pooled session for every download, so connections to the image
+        # CDN are reused instead of a new TCP+TLS handshake per image.
+        # Throttled (429) and transient 5xx responses are retried with
+        # exponential backoff instead of dropping the image.
+        self.session = requests.Session()
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods={"GET"}
+        )
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=max(20, max_workers), max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
         # Unsplash API configuration
         self.unsplash_access_key = "YOUR_UNSPLASH_ACCESS_KEY"  # Optional for demo
         self.base_url = "https://api.unsplash.com"
         
-        # Real nail art vendor data
-        self.nail_vendors = [
-            {
-                "name": "Nail Art Studio NYC",
-                "instagram": "@nailartstudionyc",
-                "booking_url": "https://nailartstudionyc.com/book",
-                "location": "New York, NY",
-                "specialties": ["3D Nail Art", "Gel Extensions", "Nail Art"]
-            },
-            {
-                "name": "Luxe Nail Bar",
-                "instagram": "@luxenailbar",
-                "booking_url": "https://luxenailbar.com/appointments",
-                "location": "Los Angeles, CA",
-                "specialties": ["Luxury Nail Art", "Acrylics", "Designer Nails"]
-            },
-            {
-                "name": "Artistic Nails by Sarah",
-                "instagram": "@artisticnailsbysarah",
-                "booking_url": "https://artisticnailsbysarah.com/book",
-                "location": "Miami, FL",
-                "specialties": ["Hand-painted Art", "3D Sculptures", "Custom Designs"]
-            },
-            {
-                "name": "Glamour Nail Studio",
-                "instagram": "@glamournailstudio",
-                "booking_url": "https://glamournailstudio.com/booking",
-                "location": "Chicago, IL",
-                "specialties": ["Glamour Nails", "Celebrity Style", "Luxury Designs"]
-            },
-            {
-                "name": "Creative Nail Art by Maria",
-                "instagram": "@creativenailartbymaria",
-                "booking_url": "https://creativenailartbymaria.com/appointments",
-                "location": "San Francisco, CA",
-                "specialties": ["Creative Designs", "Abstract Art", "Modern Styles"]
-            }
-        ]
-        
-        # Curated nail art image URLs from Unsplash (real working URLs)
-        self.nail_art_images = [
-            "https://images.unsplash.com/photo-1604654894610-df63bc536371?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894611-df63bc536372?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894612-df63bc536373?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894613-df63bc536374?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894614-df63bc536375?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894615-df63bc536376?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894616-df63bc536377?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894617-df63bc536378?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894618-df63bc536379?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894619-df63bc536380?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894620-df63bc536381?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894621-df63bc536382?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894622-df63bc536383?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894623-df63bc536384?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894624-df63bc536385?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894625-df63bc536386?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894626-df63bc536387?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894627-df63bc536388?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894628-df63bc536389?w=800&h=800&fit=crop&crop=center",
-            "https://images.unsplash.com/photo-1604654894629-df63bc536390?w=800&h=800&fit=crop&crop=center"
-        ]
-        
-        # Nail art design descriptions
-        self.nail_designs = [
-            "Floral French Manicure",
-            "3D Crystal Nail Art",
-            "Gradient Sunset Nails",
-            "Marble Effect Design",
-            "Geometric Pattern Nails",
-            "Holographic Glitter Nails",
-            "Animal Print Nail Art",
-            "Minimalist Line Art",
-            "Galaxy Nail Design",
-            "Tropical Paradise Nails",
-            "Vintage Rose Nail Art",
-            "Modern Abstract Design",
-            "Neon Color Block Nails",
-            "Elegant Pearl Accent Nails",
-            "Bold Statement Nail Art",
-            "Pastel Ombre Nails",
-            "Metallic Foil Nail Art",
-            "Watercolor Nail Design",
-            "Chrome Mirror Nails",
-            "3D Flower Nail Art"
-        ]
+        # Constant data is shared module-level tuples
+        self.nail_vendors = _NAIL_VENDORS
+        self.nail_art_images = _IMAGE_URLS
+        self.nail_designs = _NAIL_DESIGNS
     
     def get_directory_size(self, path: Path) -> int:
         """Get total size of directory in bytes"""
@@ -123,10 +167,9 @@ class UnsplashNailArtScraper:
     
     def check_storage_limit(self, file_size: int = 0) -> bool:
         """Check if adding a file would exceed storage limit"""
-        current_size = self.get_directory_size(self.download_dir)
-        return (current_size + file_size) <= self.max_storage_bytes
+        return (self._current_bytes + file_size) <= self.max_storage_bytes
     
-    def download_image(self, url: str, filename: str) -> str:
+    def download_image(self, url: str, filename: str) -> Optional[Tuple[str, int]]:
         """
         Download an image from URL and save it locally.
         
@@ -135,7 +178,7 @@ class UnsplashNailArtScraper:
             filename: Local filename to save as
             
         Returns:
-            Local file path if successful, None otherwise
+            (local file path, bytes written) if successful, None otherwise
         """
         try:
             # Create vendor directory
@@ -143,16 +186,23 @@ class UnsplashNailArtScraper:
             vendor_dir.mkdir(exist_ok=True)
             
             # Download image
-            response = requests.get(url, stream=True, timeout=30)
+            self._rate_limiter.acquire()
+            response = self.session.get(url, stream=True, timeout=30)
             response.raise_for_status()
             
-            # Save image
+            # Save image, copying the body in 1 MiB blocks rather than 8 KiB
+            # chunks so each image takes only a few write syscalls
             file_path = vendor_dir / filename
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            response.raw.decode_content = True
+            with open(file_path, 'wb', buffering=1 << 20) as f:
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+                file_size = f.tell()
             
-            return str(file_path)
+            # Account for the new file (downloads run on worker threads)
+            with self._storage_lock:
+                self._current_bytes += file_size
+            
+            return str(file_path), file_size
             
         except Exception as e:
             print(f"Error downloading {url}: {str(e)}")
@@ -173,27 +223,34 @@ class UnsplashNailArtScraper:
         
         posts = []
         
-        for i in range(min(max_images, len(self.nail_art_images))):
-            # Check storage limit
-            if not self.check_storage_limit():
-                print(f"Storage limit reached ({self.max_storage_bytes / (1024**3):.2f}GB). Stopping downloads.")
-                break
+        # Every image comes from the same CDN, so download them concurrently;
+        # the pool size bounds how many requests are in flight at once
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for i in range(min(max_images, len(self.nail_art_images))):
+                # Check storage limit (downloads still in flight aren't counted yet)
+                if not self.check_storage_limit():
+                    print(f"Storage limit reached ({self.max_storage_bytes / (1024**3):.2f}GB). Stopping downloads.")
+                    break
+                
+                # Create filename
+                filename = f"nail_art_{i:03d}.jpg"
+                
+                # Download image
+                print(f"Downloading image {i+1}/{max_images}: {self.nail_designs[i % len(self.nail_designs)]}")
+                futures.append(executor.submit(self.download_image, self.nail_art_images[i], filename))
             
+            # Results in submission order, so ids and vendors match the URLs
+            downloads = [future.result() for future in futures]
+        
+        for i, download in enumerate(downloads):
             # Get image URL and vendor info
             image_url = self.nail_art_images[i]
             vendor = self.nail_vendors[i % len(self.nail_vendors)]
             design = self.nail_designs[i % len(self.nail_designs)]
             
-            # Create filename
-            filename = f"nail_art_{i:03d}.jpg"
-            
-            # Download image
-            print(f"Downloading image {i+1}/{max_images}: {design}")
-            local_path = self.download_image(image_url, filename)
-            
-            if local_path and os.path.exists(local_path):
-                # Get file size
-                file_size = os.path.getsize(local_path)
+            if download:
+                local_path, file_size = download
                 
                 # Create post data
                 post = {
@@ -215,9 +272,6 @@ class UnsplashNailArtScraper:
                 
                 posts.append(post)
                 print(f"  ✅ Downloaded: {design} ({file_size / 1024:.1f}KB)")
-                
-                # Add delay to be respectful
-                time.sleep(random.uniform(0.5, 1.5))
             else:
                 print(f"  ❌ Failed to download: {design}")
         
@@ -234,11 +288,18 @@ class UnsplashNailArtScraper:
         """
         output_path = self.download_dir / filename
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(posts, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(posts))
+        else:
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                json.dump(posts, f, separators=(',', ':'), ensure_ascii=False)
         
         print(f"Saved {len(posts)} posts to {output_path}")
     
+    def close(self) -> None:
+        """Close the pooled HTTP session"""
+        self.session.close()
+    
     def get_storage_stats(self) -> Dict[str, Any]:
         """Get storage statistics"""
         total_size = self.get_directory_size(self.download_dir)
@@ -263,6 +324,7 @@ def main():
     
     # Save to JSON
     scraper.save_to_json(posts)
+    scraper.close()
     
     print(f"\nDataset creation completed!")
     print(f"Downloaded {len(posts)} nail art images.")
@@ -8,10 +8,15 @@ import sys
 import numpy as np
 from PIL import Image
 import io
+import traceback
+import requests
 
 # Add embeddings module to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'embeddings'))
 
+from embed import get_clip_embedding  # noqa: E402
+from query import load_index, get_index_stats  # noqa: E402
+
 def debug_similarity_search():
     """Debug the similarity search step by step."""
     print("🔍 Debugging Similarity Search")
@@ -33,7 +38,6 @@ def debug_similarity_search():
         
         # Step 1: Generate query embedding
         print("\n🔍 Step 1: Generate Query Embedding")
-        from embed import get_clip_embedding
         
         query_embedding = get_clip_embedding(image_bytes)
         print(f"   - Query embedding shape: {query_embedding.shape}")
@@ -41,28 +45,18 @@ def debug_similarity_search():
         
         # Step 2: Load the index and check stored embeddings
         print("\n🔍 Step 2: Check Stored Embeddings")
-        from query import load_index, get_index_stats
         
         # Load index
         index_path = "../data-pipeline/nail_art_index.faiss"
         metadata_path = "../data-pipeline/nail_art_metadata.pkl"
-        load_index(index_path, metadata_path)
+        index, metadata = load_index(index_path, metadata_path)
         
         # Get index stats
         stats = get_index_stats()
         print(f"   - Index stats: {stats}")
         
-        # Step 3: Manually search the index
+        # Step 3: Manually search the index (reusing the index loaded above)
         print("\n🔍 Step 3: Manual Index Search")
-        import faiss
-        
-        # Load the index manually
-        index = faiss.read_index(index_path)
-        
-        # Load metadata
-        import pickle
-        with open(metadata_path, 'rb') as f:
-            metadata = pickle.load(f)
         
         print(f"   - Index total vectors: {index.ntotal}")
         print(f"   - Metadata count: {len(metadata)}")
@@ -89,7 +83,6 @@ def debug_similarity_search():
         
         # Step 4: Check if the issue is in the API response processing
         print("\n🔍 Step 4: API Response Analysis")
-        import requests
         
         files = {'file': ('nail1.jpg', image_bytes, 'image/jpeg')}
         response = requests.post("http://localhost:8000/match", files=files)
@@ -116,7 +109,6 @@ def debug_similarity_search():
             
     except Exception as e:
         print(f"❌ Error debugging similarity search: {str(e)}")
-        import traceback
         traceback.print_exc()
         return False
     
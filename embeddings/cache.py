@@ -0,0 +1,152 @@
+import os
+import json
+import hashlib
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Default location of the on-disk embedding cache
+DEFAULT_CACHE_DIR = "embedding_cache"
+
+# Normalized CLIP vectors lose nothing measurable at half precision, and the
+# cache file is half the size
+CACHE_DTYPE = np.float16
+
+class EmbeddingCache:
+    """
+    Content-hash keyed cache of CLIP embeddings.
+
+    Embeddings live in a memory-mapped float16 `embeddings.npy` file and a JSON
+    sidecar maps `sha256(file_bytes)` to the row holding its embedding, so
+    unchanged images are never pushed through CLIP twice. The sidecar also
+    records which model produced the vectors; `bind_model` must be called
+    before embedding, and a cache from other weights is discarded.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Open (or create) an embedding cache.
+
+        Args:
+            cache_dir: Directory holding `index.json` and `embeddings.npy`
+        """
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.array_path = os.path.join(cache_dir, "embeddings.npy")
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._rows: Dict[str, int] = {}
+        self._array: Optional[np.memmap] = None
+        self.model_id: Optional[str] = None
+        self._bound = False
+
+        if os.path.exists(self.index_path) and os.path.exists(self.array_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self._rows = index["rows"]
+            self.model_id = index["model_id"]
+            self._array = np.lib.format.open_memmap(self.array_path, mode='r+')
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def bind_model(self, model_id: str) -> None:
+        """
+        Declare which model the embeddings come from.
+
+        Entries stored by any other model are dropped so its vectors are
+        never returned for this model.
+
+        Args:
+            model_id: Identity of the weights, e.g. embed.get_model_id()
+        """
+        if self.model_id != model_id and (self._rows or self._array is not None):
+            if self._rows:
+                print(f"Embedding cache was built with {self.model_id}, "
+                      f"not {model_id}; starting it fresh")
+            self._rows = {}
+            self._array = None
+            if os.path.exists(self.array_path):
+                os.remove(self.array_path)
+        self.model_id = model_id
+        self._bound = True
+
+    def get(self, digest: str) -> Optional[np.ndarray]:
+        """Return the cached embedding for a content hash, if any."""
+        row = self._rows.get(digest)
+        if row is None or self._array is None:
+            return None
+        return np.array(self._array[row], dtype=np.float32)
+
+    def put(self, digest: str, embedding: np.ndarray) -> None:
+        """Store an embedding under its content hash."""
+        if digest in self._rows:
+            return
+
+        embedding = np.asarray(embedding, dtype=np.float32).ravel()
+        row = len(self._rows)
+        self._ensure_capacity(row + 1, embedding.shape[0])
+        self._array[row] = embedding
+        self._rows[digest] = row
+
+    def embed_batch(self, images_bytes: List[bytes],
+                    embed_batch_fn: Callable[[List[bytes]], Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """
+        Return embeddings for a batch of images, calling `embed_batch_fn` once on the misses.
+
+        Args:
+            images_bytes: List of raw image bytes
+            embed_batch_fn: Function returning an (N, D) array and an (N,) boolean
+                mask from a list of image bytes; rows whose mask is False are
+                fallback vectors and are never stored
+
+        Returns:
+            Array of embeddings in the same order as `images_bytes`
+        """
+        self._require_model()
+        digests = [hashlib.sha256(image_bytes).hexdigest() for image_bytes in images_bytes]
+        embeddings = [self.get(digest) for digest in digests]
+
+        misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if misses:
+            computed, real = embed_batch_fn([images_bytes[i] for i in misses])
+            for i, embedding, is_real in zip(misses, computed, real):
+                if is_real:
+                    self.put(digests[i], embedding)
+                embeddings[i] = embedding
+
+        return np.stack(embeddings)
+
+    def _require_model(self) -> None:
+        if not self._bound:
+            raise RuntimeError("Call bind_model() before embedding through the cache")
+
+    def _ensure_capacity(self, rows: int, dimension: int) -> None:
+        """Grow the memory-mapped array (doubling) so it can hold `rows` rows."""
+        if self._array is not None and self._array.shape[0] >= rows:
+            return
+
+        capacity = max(rows, 64)
+        if self._array is not None:
+            capacity = max(capacity, self._array.shape[0] * 2)
+            dimension = self._array.shape[1]
+
+        tmp_path = self.array_path + ".tmp"
+        grown = np.lib.format.open_memmap(
+            tmp_path, mode='w+', dtype=CACHE_DTYPE, shape=(capacity, dimension)
+        )
+        if self._array is not None:
+            used = len(self._rows)
+            grown[:used] = self._array[:used]
+            del self._array
+        grown.flush()
+        del grown
+
+        os.replace(tmp_path, self.array_path)
+        self._array = np.lib.format.open_memmap(self.array_path, mode='r+')
+
+    def save(self) -> None:
+        """Flush embeddings and persist the hash -> row mapping."""
+        if self._array is not None:
+            self._array.flush()
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump({"model_id": self.model_id, "rows": self._rows}, f)
@@ -0,0 +1,648 @@
+"""
+Shared CLIP embedding runtime for the embed variants.
+
+embed.py, embed_trained.py and embed_original.py only differ in which
+checkpoint they load. Each one passes a checkpoint loader to ClipRuntime and
+re-exports the runtime's functions, so switch_clip_model.py can keep
+swapping the variant files while preprocessing, batching, caching and index
+building live here once.
+"""
+
+import os
+import gc
+import pickle
+import numpy as np
+from typing import Callable, List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PIL import Image
+import io
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import torch
+import torch.nn.functional as F
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only the metadata pickle is written without it
+    pa = None
+    pq = None
+
+if TYPE_CHECKING:
+    from cache import EmbeddingCache
+
+# Loads (model, processor, model_id) for a dtype; model_id identifies the weights
+CheckpointLoader = Callable[[torch.dtype], Tuple[Any, Any, str]]
+
+# Images in a batch are decoded and resized on these threads (PIL releases
+# the GIL), so CPU preprocessing no longer runs one image at a time
+PREPROCESS_WORKERS = 8
+_preprocess_pool = ThreadPoolExecutor(max_workers=PREPROCESS_WORKERS)
+
+# Recently embedded images keyed by a 16-byte BLAKE2b digest of their bytes,
+# so the same photo submitted again skips the CLIP forward pass
+EMBEDDING_LRU_SIZE = 4096
+
+# Threads reading image files ahead of the CLIP forward pass
+READ_WORKERS = 8
+
+# Concurrent image downloads in build_index_from_urls
+DOWNLOAD_WORKERS = 16
+
+# Vectors converted to float32 and added to FAISS at a time
+ADD_CHUNK = 4096
+
+# Collections at least this large get an HNSW graph instead of a flat scan
+HNSW_MIN_VECTORS = 10000
+HNSW_M = 32
+
+# Shared HTTP session so image downloads reuse pooled connections instead of
+# a new TCP+TLS handshake per image; 429/5xx responses are retried with
+# exponential backoff
+_session = requests.Session()
+_retry = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods={"GET"}
+)
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=32, max_retries=_retry)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+def model_identity(source: str, dtype: torch.dtype) -> str:
+    """Describe a checkpoint: hub name or local path plus newest file mtime, and dtype."""
+    if os.path.isdir(source):
+        stamp = max((entry.stat().st_mtime for entry in os.scandir(source) if entry.is_file()), default=0)
+        source = f"{os.path.abspath(source)}@{stamp:.0f}"
+    return f"{source}|{dtype}"
+
+def preprocess_image_consistently(image_bytes: bytes) -> bytes:
+    """
+    Preprocess image consistently for both index building and querying.
+    This ensures exact same processing pipeline to get 99-100% similarity.
+
+    Args:
+        image_bytes: Raw image bytes
+
+    Returns:
+        Preprocessed image bytes
+    """
+    try:
+        # Convert bytes to PIL Image
+        image = Image.open(io.BytesIO(image_bytes))
+
+        # Convert to RGB if needed
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        # Resize to CLIP standard size (224x224)
+        image = image.resize((224, 224), Image.Resampling.LANCZOS)
+
+        # Convert back to bytes with consistent quality
+        img_byte_arr = io.BytesIO()
+        image.save(img_byte_arr, format='JPEG', quality=95, optimize=False)
+        img_byte_arr = img_byte_arr.getvalue()
+
+        return img_byte_arr
+
+    except Exception as e:
+        print(f"Error preprocessing image: {str(e)}")
+        return image_bytes
+
+def _open_preprocessed(image_bytes: bytes) -> Image.Image:
+    """Preprocess image bytes and fully decode the result (runs on the preprocessing threads)."""
+    image = Image.open(io.BytesIO(preprocess_image_consistently(image_bytes)))
+    image.load()
+    return image
+
+def _image_embeds(model, pixel_values: torch.Tensor) -> torch.Tensor:
+    """Run the vision tower, dropping back to eager mode if the compiled forward fails."""
+    try:
+        return model(pixel_values=pixel_values).image_embeds
+    except Exception as e:
+        if vars(model).pop("forward", None) is None:
+            raise
+        print(f"Compiled forward failed, using eager model: {e}")
+        return model(pixel_values=pixel_values).image_embeds
+
+def _mock_embedding(image_bytes: bytes) -> np.ndarray:
+    """Random unit vector standing in for an image CLIP could not embed."""
+    image_hash = hashlib.md5(image_bytes).hexdigest()
+    random.seed(int(image_hash[:8], 16))
+
+    # Generate a 768-dimensional embedding (same as CLIP-L/14)
+    embedding = np.random.normal(0, 1, 768).astype(np.float32)
+    return embedding / np.linalg.norm(embedding)
+
+def download_image(url: str) -> Optional[bytes]:
+    """
+    Download image from URL.
+
+    Args:
+        url: Image URL
+
+    Returns:
+        Image bytes or None if failed
+    """
+    try:
+        response = _session.get(url, timeout=10)
+        response.raise_for_status()
+        return response.content
+    except Exception as e:
+        print(f"Failed to download image from {url}: {str(e)}")
+        return None
+
+def create_faiss_index(dimension: int, num_vectors: int = 0, index_factory: Optional[str] = None):
+    """
+    Create an empty FAISS index for normalized CLIP embeddings.
+
+    Vectors are stored as float16, halving index size and scan bandwidth
+    versus IndexFlatIP; inner product on normalized vectors is cosine
+    similarity. fp16 scalar quantization needs no training. From
+    `HNSW_MIN_VECTORS` vectors on, the fp16 storage sits under an HNSW
+    graph so queries stay sub-linear; `efSearch` is saved with the index.
+    An explicit `index_factory` string (e.g. "IVF256,PQ32") overrides both.
+
+    Args:
+        dimension: Embedding dimension
+        num_vectors: Number of vectors that will be added
+        index_factory: Optional faiss.index_factory description
+
+    Returns:
+        FAISS index ready for `add`
+    """
+    import faiss
+
+    if index_factory:
+        return faiss.index_factory(dimension, index_factory, faiss.METRIC_INNER_PRODUCT)
+
+    if num_vectors >= HNSW_MIN_VECTORS:
+        index = faiss.IndexHNSWSQ(
+            dimension, faiss.ScalarQuantizer.QT_fp16, HNSW_M, faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = 64
+        return index
+
+    return faiss.IndexScalarQuantizer(
+        dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+    )
+
+def _read_file(image_path: str) -> Optional[bytes]:
+    """Read an image file, returning None (and logging) if it cannot be read."""
+    try:
+        with open(image_path, 'rb') as f:
+            return f.read()
+    except Exception as e:
+        print(f"Failed to process {image_path}: {str(e)}")
+        return None
+
+class ClipRuntime:
+    """
+    A lazily loaded CLIP image encoder and everything that embeds with it.
+
+    The checkpoint loader is the only per-variant piece; it is called once,
+    on first use, with the inference dtype.
+    """
+
+    def __init__(self, load_checkpoint: CheckpointLoader, name: str = "CLIP"):
+        """
+        Args:
+            load_checkpoint: Returns (model, processor, model_id) for a dtype
+            name: Model name used in log messages
+        """
+        self._load_checkpoint = load_checkpoint
+        self.name = name
+
+        self._model = None
+        self._processor = None
+
+        # Set at model load: device, fast-path input size and normalization tensors
+        self._device = None
+        self._input_size = None
+        self._pixel_scale = None
+        self._pixel_mean = None
+        self._pixel_std = None
+
+        # Identity of the loaded weights (checkpoint and dtype), so embedding
+        # caches never mix vectors from different models
+        self._model_id = None
+
+        self._embedding_lru: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._embedding_lru_lock = threading.Lock()
+
+        # Device-side uint8 input buffers for batched embedding, keyed by
+        # calling thread and batch shape, so index builds reuse one allocation
+        # per shape instead of allocating a fresh input tensor every batch
+        self._staging: Dict[tuple, torch.Tensor] = {}
+
+    def get_clip_model(self):
+        """Get or load the CLIP model and processor."""
+        if self._model is None or self._processor is None:
+            print(f"Loading {self.name} model...")
+
+            # Load weights straight into the inference dtype (half precision on
+            # GPU, which roughly doubles ViT-L/14 tensor-core throughput) instead
+            # of materializing a float32 copy first; safetensors are preferred.
+            # Loaders load only the vision tower and its projection from the
+            # CLIP checkpoint: the text encoder is never used here
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            dtype = torch.float16 if device == "cuda" else torch.float32
+
+            model, processor, self._model_id = self._load_checkpoint(dtype)
+
+            # Move to GPU if available; features are cast back to float32
+            # before normalizing
+            model = model.to(device)
+            model.eval()
+
+            # Resolve the device and normalization constants once instead of on
+            # every embedding call
+            self._device = next(model.parameters()).device
+            image_processor = processor.image_processor
+            try:
+                input_size = (image_processor.crop_size["width"], image_processor.crop_size["height"])
+                if image_processor.size["shortest_edge"] != input_size[1]:
+                    input_size = None
+                self._pixel_scale = float(image_processor.rescale_factor)
+                self._pixel_mean = torch.tensor(image_processor.image_mean, device=self._device).view(1, 3, 1, 1)
+                self._pixel_std = torch.tensor(image_processor.image_std, device=self._device).view(1, 3, 1, 1)
+                self._input_size = input_size
+            except (AttributeError, KeyError, TypeError):
+                # Older processor configs: let the processor handle everything
+                self._input_size = None
+
+            # Compile the image tower once at load on GPU; the warm-up forward
+            # pays the compile cost here instead of on the first query. The batch
+            # dimension is dynamic so new batch sizes don't recompile, and the
+            # compiled forward is only installed once the warm-up succeeded
+            if device == "cuda" and hasattr(torch, "compile"):
+                try:
+                    compiled_forward = torch.compile(model.forward, mode="reduce-overhead", dynamic=True)
+                    with torch.inference_mode():
+                        compiled_forward(pixel_values=torch.zeros(1, 3, 224, 224, device=device, dtype=model.dtype))
+                    model.forward = compiled_forward
+                except Exception as e:
+                    print(f"torch.compile failed, using eager model: {e}")
+
+            self._model, self._processor = model, processor
+            print(f"{self.name} model loaded on {device}")
+
+        return self._model, self._processor
+
+    def get_model_id(self) -> str:
+        """Load the CLIP model if needed and return the identity of its weights."""
+        self.get_clip_model()
+        return self._model_id
+
+    def _pixel_values(self, images: List[Image.Image], stage: bool = False) -> torch.Tensor:
+        """
+        Turn preprocessed images into CLIP `pixel_values` on the model's device.
+
+        preprocess_image_consistently already produces RGB images at the model's
+        input size, so the processor's resize and center crop would be no-ops.
+        The raw uint8 pixels are shipped to the device (a quarter of the float32
+        bytes) and rescaled/normalized there with the cached constants. Images
+        of any other size or mode go through the full processor.
+
+        Args:
+            images: Preprocessed PIL images
+            stage: Copy into a reusable device buffer (batched path only)
+
+        Returns:
+            Tensor of shape (N, 3, H, W) in the model's dtype
+        """
+        if self._input_size is None or any(image.size != self._input_size or image.mode != 'RGB' for image in images):
+            pixel_values = self._processor(images=images, return_tensors="pt")["pixel_values"]
+            return pixel_values.to(self._device, dtype=self._model.dtype)
+
+        pixels = torch.from_numpy(np.stack([np.asarray(image) for image in images]))
+
+        # Page-locked host memory lets the copy to the GPU run asynchronously
+        if self._device.type == "cuda":
+            pixels = pixels.pin_memory()
+            if stage:
+                key = (threading.get_ident(), tuple(pixels.shape))
+                if key not in self._staging:
+                    self._staging[key] = torch.empty(pixels.shape, dtype=torch.uint8, device=self._device)
+                pixels = self._staging[key].copy_(pixels, non_blocking=True)
+
+        # (N, H, W, C) uint8 -> (N, C, H, W) normalized
+        pixels = pixels.to(self._device, non_blocking=True).permute(0, 3, 1, 2).float()
+        pixels = (pixels * self._pixel_scale - self._pixel_mean) / self._pixel_std
+        return pixels.to(self._model.dtype)
+
+    def _release_gpu_memory(self) -> None:
+        """Drop the staging buffers and return cached CUDA memory to the driver."""
+        self._staging.clear()
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _remember_embedding(self, digest: bytes, embedding: np.ndarray) -> None:
+        """Store an embedding in the in-memory LRU, evicting the oldest entry when full."""
+        with self._embedding_lru_lock:
+            self._embedding_lru[digest] = embedding.copy()
+            self._embedding_lru.move_to_end(digest)
+            if len(self._embedding_lru) > EMBEDDING_LRU_SIZE:
+                self._embedding_lru.popitem(last=False)
+
+    def get_clip_embedding(self, image_bytes: bytes) -> np.ndarray:
+        """
+        Generate the CLIP embedding for an image.
+
+        Args:
+            image_bytes: Raw image bytes
+
+        Returns:
+            CLIP embedding as numpy array (768 dimensions)
+        """
+        return self.get_clip_embedding_checked(image_bytes)[0]
+
+    def get_clip_embedding_checked(self, image_bytes: bytes) -> Tuple[np.ndarray, bool]:
+        """
+        Like get_clip_embedding, but also report whether CLIP produced the vector.
+
+        Args:
+            image_bytes: Raw image bytes
+
+        Returns:
+            (embedding, True), or (mock embedding, False) if CLIP failed
+        """
+        digest = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        with self._embedding_lru_lock:
+            cached = self._embedding_lru.get(digest)
+            if cached is not None:
+                self._embedding_lru.move_to_end(digest)
+                return cached.copy(), True
+
+        try:
+            # Preprocess image consistently
+            processed_bytes = preprocess_image_consistently(image_bytes)
+
+            # Load model and processor
+            model, processor = self.get_clip_model()
+
+            # Convert processed bytes to PIL Image
+            image = Image.open(io.BytesIO(processed_bytes))
+
+            # Rescale and normalize for CLIP on the model's device
+            pixel_values = self._pixel_values([image])
+
+            # Generate embedding
+            with torch.inference_mode():
+                image_features = _image_embeds(model, pixel_values)
+
+            # Normalize for cosine similarity on the device, then copy to numpy
+            embedding = F.normalize(image_features.float(), p=2, dim=-1).squeeze(0).cpu().numpy()
+
+            self._remember_embedding(digest, embedding)
+
+            return embedding, True
+
+        except Exception as e:
+            print(f"Error generating CLIP embedding: {str(e)}")
+
+            # Fallback to mock embedding if CLIP fails
+            return _mock_embedding(image_bytes), False
+
+    def get_clip_embeddings(self, images_bytes: List[bytes]) -> np.ndarray:
+        """
+        Generate CLIP embeddings for a batch of images in one forward pass.
+
+        Args:
+            images_bytes: List of raw image bytes
+
+        Returns:
+            Array of shape (N, 768), one normalized embedding per image
+        """
+        return self.get_clip_embeddings_checked(images_bytes)[0]
+
+    def get_clip_embeddings_checked(self, images_bytes: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Like get_clip_embeddings, but also report which vectors CLIP produced.
+
+        Args:
+            images_bytes: List of raw image bytes
+
+        Returns:
+            (N, 768) embeddings and an (N,) boolean mask that is False where the
+            mock fallback embedding was used
+        """
+        try:
+            # Load model and processor
+            model, processor = self.get_clip_model()
+
+            # Preprocess every image the same way as get_clip_embedding, in parallel
+            images = list(_preprocess_pool.map(_open_preprocessed, images_bytes))
+
+            # Rescale and normalize the whole batch at once on the model's device
+            pixel_values = self._pixel_values(images, stage=True)
+
+            # Generate embeddings
+            with torch.inference_mode():
+                image_features = _image_embeds(model, pixel_values)
+
+            # Normalize each row for cosine similarity on the device, then copy to numpy
+            embeddings = F.normalize(image_features.float(), p=2, dim=-1).cpu().numpy()
+
+            return embeddings, np.ones(len(embeddings), dtype=bool)
+
+        except Exception as e:
+            print(f"Error generating batched CLIP embeddings: {str(e)}")
+
+            # Fall back to one image at a time (including its mock fallback)
+            results = [self.get_clip_embedding_checked(image_bytes) for image_bytes in images_bytes]
+            return np.stack([embedding for embedding, _ in results]), np.array([real for _, real in results])
+
+    def build_index(self, image_paths: List[str], metadata: List[Dict[str, Any]],
+                    index_path: str = "nail_art_index.faiss",
+                    metadata_path: str = "nail_art_metadata.pkl",
+                    cache: Optional["EmbeddingCache"] = None,
+                    batch_size: int = 32,
+                    index_factory: Optional[str] = None) -> None:
+        """
+        Build FAISS index from image paths and metadata.
+
+        Args:
+            image_paths: List of image file paths
+            metadata: List of metadata dictionaries
+            index_path: Path to save FAISS index
+            metadata_path: Path to save metadata
+            cache: Optional embedding cache; unchanged images skip the CLIP forward pass
+            batch_size: Images per CLIP forward pass
+            index_factory: Optional faiss.index_factory string (e.g. "HNSW32", "IVF256,PQ32")
+        """
+        import faiss
+
+        # Embeddings are written straight into a float16 .npy next to the index
+        # (created once the first batch fixes the dimension), so RAM holds one
+        # batch at a time and other index layouts can be built without re-embedding
+        embeddings_path = os.path.splitext(index_path)[0] + "_embeddings.npy"
+        embeddings_array = None
+        count = 0
+        valid_metadata = []
+        total = len(image_paths)
+        pairs = list(zip(image_paths, metadata))
+
+        print(f"Processing {total} images...")
+
+        # Cached vectors are only reused for the same weights
+        if cache is not None:
+            cache.bind_model(self.get_model_id())
+
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+            def submit_reads(start: int) -> list:
+                return [pool.submit(_read_file, image_path)
+                        for image_path, _ in pairs[start:start + batch_size]]
+
+            # Read the next batch from disk while CLIP embeds the current one
+            pending = submit_reads(0)
+            for start in range(0, len(pairs), batch_size):
+                reads = pending
+                pending = submit_reads(start + batch_size)
+
+                batch_bytes = []
+                batch_metadata = []
+
+                for read, (_, meta) in zip(reads, pairs[start:start + batch_size]):
+                    image_bytes = read.result()
+                    if image_bytes is None:
+                        continue
+                    batch_bytes.append(image_bytes)
+                    batch_metadata.append(meta)
+
+                if not batch_bytes:
+                    continue
+
+                # One CLIP forward pass per batch (cached images skip it entirely)
+                if cache is not None:
+                    batch_embeddings = cache.embed_batch(batch_bytes, self.get_clip_embeddings_checked)
+                else:
+                    batch_embeddings = self.get_clip_embeddings(batch_bytes)
+                if embeddings_array is None:
+                    embeddings_array = np.lib.format.open_memmap(
+                        embeddings_path, mode='w+', dtype=np.float16,
+                        shape=(len(pairs), batch_embeddings.shape[1])
+                    )
+                embeddings_array[count:count + len(batch_embeddings)] = batch_embeddings
+                count += len(batch_embeddings)
+                valid_metadata.extend(batch_metadata)
+
+                print(f"Processed {min(start + batch_size, total)}/{total} images")
+
+        if cache is not None:
+            cache.save()
+
+        if not count:
+            raise Exception("No valid embeddings generated")
+
+        dimension = embeddings_array.shape[1]
+        if count < len(embeddings_array):
+            # Some images failed: keep only the rows that were filled
+            tmp_path = embeddings_path + ".tmp"
+            trimmed = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float16, shape=(count, dimension))
+            for start in range(0, count, ADD_CHUNK):
+                trimmed[start:start + ADD_CHUNK] = embeddings_array[start:start + ADD_CHUNK]
+            trimmed.flush()
+            del trimmed, embeddings_array
+            os.replace(tmp_path, embeddings_path)
+        else:
+            embeddings_array.flush()
+            del embeddings_array
+        embeddings_array = np.load(embeddings_path, mmap_mode='r')
+
+        # Build FAISS index
+        index = create_faiss_index(dimension, count, index_factory)  # inner product for cosine similarity
+
+        # Factory indexes such as IVF/PQ must be trained before vectors are added
+        if not index.is_trained:
+            index.train(np.asarray(embeddings_array, dtype=np.float32))
+
+        # Add vectors to index in float32 chunks so peak RAM stays bounded
+        for start in range(0, count, ADD_CHUNK):
+            index.add(np.asarray(embeddings_array[start:start + ADD_CHUNK], dtype=np.float32))
+
+        # Save index and metadata
+        faiss.write_index(index, index_path)
+
+        with open(metadata_path, 'wb') as f:
+            pickle.dump(valid_metadata, f)
+
+        # Columnar copy that query.load_index memory-maps instead of unpickling
+        if pq is not None:
+            parquet_path = os.path.splitext(metadata_path)[0] + ".parquet"
+            # One column per key seen in any row (from_pylist would take the
+            # schema from the first row alone); rows lacking a key get nulls
+            keys = list(dict.fromkeys(key for meta in valid_metadata for key in meta))
+            try:
+                table = pa.table({key: [meta.get(key) for meta in valid_metadata] for key in keys})
+                pq.write_table(table, parquet_path)
+                print(f"Metadata table saved to {parquet_path}")
+            except pa.ArrowException as e:
+                print(f"Skipping Parquet metadata: {e}")
+
+        # Let other models on the GPU use the memory the batches held
+        self._release_gpu_memory()
+
+        print(f"Built index with {count} vectors")
+        print(f"Index saved to {index_path}")
+        print(f"Embeddings saved to {embeddings_path}")
+        print(f"Metadata saved to {metadata_path}")
+
+    def build_index_from_urls(self, image_urls: List[str], metadata: List[Dict[str, Any]],
+                              download_dir: str = "downloaded_images",
+                              index_path: str = "nail_art_index.faiss",
+                              metadata_path: str = "nail_art_metadata.pkl") -> None:
+        """
+        Build FAISS index from image URLs, embedding them in batches via build_index.
+
+        Args:
+            image_urls: List of image URLs
+            metadata: List of metadata dictionaries
+            download_dir: Directory to save downloaded images
+            index_path: Path to save FAISS index
+            metadata_path: Path to save metadata
+        """
+        # Create download directory
+        os.makedirs(download_dir, exist_ok=True)
+
+        downloaded_paths = []
+        valid_metadata = []
+
+        print(f"Downloading {len(image_urls)} images...")
+
+        # Downloads are network-bound: fetch them concurrently over the pooled
+        # session and save them in order as they complete
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+            downloads = pool.map(download_image, image_urls[:len(metadata)])
+
+            for i, (url, meta, image_bytes) in enumerate(zip(image_urls, metadata, downloads)):
+                try:
+                    if image_bytes is None:
+                        continue
+
+                    # Save image locally
+                    filename = f"image_{i}.jpg"
+                    filepath = os.path.join(download_dir, filename)
+                    with open(filepath, 'wb') as f:
+                        f.write(image_bytes)
+
+                    downloaded_paths.append(filepath)
+                    valid_metadata.append(meta)
+
+                    if (i + 1) % 10 == 0:
+                        print(f"Downloaded {i + 1}/{len(image_urls)} images")
+
+                except Exception as e:
+                    print(f"Failed to process {url}: {str(e)}")
+                    continue
+
+        # One CLIP forward pass per batch instead of one per image
+        self.build_index(downloaded_paths, valid_metadata, index_path, metadata_path)
@@ -1,277 +1,58 @@
-import os
-import pickle
 import numpy as np
-from typing import List, Dict, Any, Optional
-import requests
-from PIL import Image
-import io
 import torch
-from transformers import CLIPProcessor, CLIPModel
-
-# Global variables to cache model and processor
-_model = None
-_processor = None
-
-def get_clip_model():
-    """Get or load CLIP-L/14 model and processor."""
-    global _model, _processor
-    
-    if _model is None or _processor is None:
-        print("Loading CLIP-L/14 model...")
-        model_name = "openai/clip-vit-large-patch14"
-        _model = CLIPModel.from_pretrained(model_name)
-        _processor = CLIPProcessor.from_pretrained(model_name)
-        
-        # Move to GPU if available
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        _model = _model.to(device)
-        print(f"CLIP-L/14 model loaded on {device}")
-    
-    return _model, _processor
-
-def preprocess_image_consistently(image_bytes: bytes) -> bytes:
-    """
-    Preprocess image consistently for both index building and querying.
-    This ensures exact same processing pipeline to get 99-100% similarity.
-    
-    Args:
-        image_bytes: Raw image bytes
-        
-    Returns:
-        Preprocessed image bytes
-    """
-    try:
-        # Convert bytes to PIL Image
-        image = Image.open(io.BytesIO(image_bytes))
-        
-        # Convert to RGB if needed
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Resize to CLIP standard size (224x224)
-        image = image.resize((224, 224), Image.Resampling.LANCZOS)
-        
-        # Convert back to bytes with consistent quality
-        img_byte_arr = io.BytesIO()
-        image.save(img_byte_arr, format='JPEG', quality=95, optimize=False)
-        img_byte_arr = img_byte_arr.getvalue()
-        
-        return img_byte_arr
-        
-    except Exception as e:
-        print(f"Warning: Image preprocessing failed, using original: {str(e)}")
-        return image_bytes
-
-def get_clip_embedding(image_bytes: bytes) -> np.ndarray:
-    """
-    Generate CLIP-L/14 embedding for an image with consistent preprocessing.
-    
-    Args:
-        image_bytes: Raw image bytes
-        
-    Returns:
-        CLIP embedding as numpy array (768 dimensions)
-    """
-    try:
-        # Preprocess image consistently
-        processed_bytes = preprocess_image_consistently(image_bytes)
-        
-        # Load model and processor
-        model, processor = get_clip_model()
-        
-        # Convert processed bytes to PIL Image
-        image = Image.open(io.BytesIO(processed_bytes))
-        
-        # Process image with CLIP processor
-        inputs = processor(images=image, return_tensors="pt")
-        
-        # Move inputs to same device as model
-        device = next(model.parameters()).device
-        inputs = {k: v.to(device) for k, v in inputs.items()}
-        
-        # Generate embedding
-        with torch.no_grad():
-            image_features = model.get_image_features(**inputs)
-            
-        # Convert to numpy and normalize
-        embedding = image_features.cpu().numpy().astype(np.float32)
-        
-        # Normalize for cosine similarity
-        embedding = embedding / np.linalg.norm(embedding)
-        
-        return embedding.flatten()
-        
-    except Exception as e:
-        print(f"Error generating CLIP embedding: {str(e)}")
-        
-        # Fallback to mock embedding if CLIP fails
-        import hashlib
-        import random
-        
-        image_hash = hashlib.md5(image_bytes).hexdigest()
-        random.seed(int(image_hash[:8], 16))
-        
-        # Generate a 768-dimensional embedding (same as CLIP-L/14)
-        embedding = np.random.normal(0, 1, 768).astype(np.float32)
-        embedding = embedding / np.linalg.norm(embedding)
-        
-        return embedding
-
-def download_image(url: str) -> Optional[bytes]:
-    """
-    Download image from URL.
-    
-    Args:
-        url: Image URL
-        
-    Returns:
-        Image bytes or None if failed
-    """
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.content
-    except Exception as e:
-        print(f"Failed to download image from {url}: {str(e)}")
-        return None
-
-def build_index(image_paths: List[str], metadata: List[Dict[str, Any]], 
-                index_path: str = "nail_art_index.faiss", 
-                metadata_path: str = "nail_art_metadata.pkl") -> None:
-    """
-    Build FAISS index from image paths and metadata.
-    
-    Args:
-        image_paths: List of image file paths
-        metadata: List of metadata dictionaries
-        index_path: Path to save FAISS index
-        metadata_path: Path to save metadata
-    """
-    import faiss
-    
-    embeddings = []
-    valid_metadata = []
-    
-    print(f"Processing {len(image_paths)} images...")
-    
-    for i, (image_path, meta) in enumerate(zip(image_paths, metadata)):
-        try:
-            # Read image file
-            with open(image_path, 'rb') as f:
-                image_bytes = f.read()
-            
-            # Generate embedding
-            embedding = get_clip_embedding(image_bytes)
-            embeddings.append(embedding)
-            valid_metadata.append(meta)
-            
-            if (i + 1) % 10 == 0:
-                print(f"Processed {i + 1}/{len(image_paths)} images")
-                
-        except Exception as e:
-            print(f"Failed to process {image_path}: {str(e)}")
-            continue
-    
-    if not embeddings:
-        raise Exception("No valid embeddings generated")
-    
-    # Convert to numpy array
-    embeddings_array = np.array(embeddings, dtype=np.float32)
-    
-    # Build FAISS index
-    dimension = embeddings_array.shape[1]
-    index = faiss.IndexFlatIP(dimension)  # Inner product for cosine similarity
-    
-    # Normalize embeddings for cosine similarity (already done in get_clip_embedding)
-    # faiss.normalize_L2(embeddings_array)  # Not needed since we normalize in embedding function
-    
-    # Add vectors to index
-    index.add(embeddings_array)
-    
-    # Save index and metadata
-    faiss.write_index(index, index_path)
-    
-    with open(metadata_path, 'wb') as f:
-        pickle.dump(valid_metadata, f)
-    
-    print(f"Built index with {len(embeddings)} vectors")
-    print(f"Index saved to {index_path}")
-    print(f"Metadata saved to {metadata_path}")
-
-def build_index_from_urls(image_urls: List[str], metadata: List[Dict[str, Any]],
-                         download_dir: str = "downloaded_images",
-                         index_path: str = "nail_art_index.faiss",
-                         metadata_path: str = "nail_art_metadata.pkl") -> None:
-    """
-    Build FAISS index from image URLs by downloading them first.
-    
-    Args:
-        image_urls: List of image URLs
-        metadata: List of metadata dictionaries
-        download_dir: Directory to save downloaded images
-        index_path: Path to save FAISS index
-        metadata_path: Path to save metadata
-    """
-    # Create download directory
-    os.makedirs(download_dir, exist_ok=True)
-    
-    downloaded_paths = []
-    valid_metadata = []
-    
-    print(f"Downloading {len(image_urls)} images...")
-    
-    for i, (url, meta) in enumerate(zip(image_urls, metadata)):
-        try:
-            # Download image
-            image_bytes = download_image(url)
-            if image_bytes is None:
-                continue
-            
-            # Save to file
-            filename = f"image_{i:04d}.jpg"
-            filepath = os.path.join(download_dir, filename)
-            
-            with open(filepath, 'wb') as f:
-                f.write(image_bytes)
-            
-            downloaded_paths.append(filepath)
-            valid_metadata.append(meta)
-            
-            if (i + 1) % 10 == 0:
-                print(f"Downloaded {i + 1}/{len(image_urls)} images")
-                
-        except Exception as e:
-            print(f"Failed to download {url}: {str(e)}")
-            continue
-    
-    # Build index from downloaded images
-    build_index(downloaded_paths, valid_metadata, index_path, metadata_path) 
+from transformers import CLIPProcessor, CLIPVisionModelWithProjection
+
+try:
+    from clip_runtime import (
+        ClipRuntime, model_identity, preprocess_image_consistently,
+        download_image, create_faiss_index
+    )
+except ModuleNotFoundError:  # imported through the embeddings package from the repo root
+    from embeddings.clip_runtime import (
+        ClipRuntime, model_identity, preprocess_image_consistently,
+        download_image, create_faiss_index
+    )
+
+def _load_checkpoint(dtype: torch.dtype):
+    """Load the original CLIP-L/14 vision tower."""
+    model_name = "openai/clip-vit-large-patch14"
+    model = CLIPVisionModelWithProjection.from_pretrained(model_name, torch_dtype=dtype)
+    processor = CLIPProcessor.from_pretrained(model_name)
+    return model, processor, model_identity(model_name, dtype)
+
+_runtime = ClipRuntime(_load_checkpoint, name="CLIP-L/14")
+
+get_clip_model = _runtime.get_clip_model
+get_model_id = _runtime.get_model_id
+get_clip_embedding = _runtime.get_clip_embedding
+get_clip_embedding_checked = _runtime.get_clip_embedding_checked
+get_clip_embeddings = _runtime.get_clip_embeddings
+get_clip_embeddings_checked = _runtime.get_clip_embeddings_checked
+build_index = _runtime.build_index
+build_index_from_urls = _runtime.build_index_from_urls
 
 def test_exact_image_similarity(image1_bytes: bytes, image2_bytes: bytes) -> float:
     """
     Test exact similarity between two images by comparing their embeddings directly.
     This should give us 99-100% similarity for identical images.
-    
+
     Args:
         image1_bytes: First image bytes
         image2_bytes: Second image bytes
-        
+
     Returns:
         Similarity score (0-1, where 1 = identical)
     """
     try:
-        # Generate embeddings for both images
-        embedding1 = get_clip_embedding(image1_bytes)
-        embedding2 = get_clip_embedding(image2_bytes)
-        
-        # Calculate cosine similarity directly
-        similarity = np.dot(embedding1, embedding2)
-        
-        # Ensure result is in 0-1 range
-        similarity = max(0, min(1, (similarity + 1) / 2))
-        
-        return float(similarity)
-        
+        # Embed both images in one two-image batch (one forward pass)
+        embedding1, embedding2 = get_clip_embeddings([image1_bytes, image2_bytes])
+
+        # Cosine similarity of the unit vectors, mapped to 0-1 the same way
+        # vector_search scores hits; the clip only absorbs rounding error
+        similarity = float(np.dot(embedding1, embedding2))
+
+        return min(1.0, max(0.0, (similarity + 1) / 2))
+
     except Exception as e:
         print(f"Error testing exact similarity: {str(e)}")
-        return 0.0 
\ No newline at end of file
+        return 0.0
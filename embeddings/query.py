@@ -1,23 +1,73 @@
 import os
 import pickle
 import numpy as np
-from typing import List, Dict, Any
+from collections.abc import Sequence
+from typing import List, Dict, Any, Tuple
 import faiss
 
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; metadata is unpickled without it
+    pq = None
+
 # Global variables to cache index and metadata
 _index = None
 _metadata = None
 
+# Metadata fields returned with each hit, kept as parallel object arrays so a
+# search picks every hit's values with one fancy-index per field
+RESULT_FIELDS = ("local_path", "booking_link", "title", "artist")
+_result_fields: Dict[str, np.ndarray] = {}
+
+# Inverted lists scanned per query when the index is IVF-based
+IVF_NPROBE = 16
+
+class _ParquetMetadata(Sequence):
+    """Read-only list of metadata dicts backed by a memory-mapped Parquet table."""
+    
+    def __init__(self, table):
+        self._table = table
+    
+    def __len__(self) -> int:
+        return self._table.num_rows
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self._table.slice(range(len(self))[i], 1).to_pylist()[0]
+
+def _load_parquet_metadata(parquet_path: str) -> Tuple[_ParquetMetadata, Dict[str, np.ndarray]]:
+    """Memory-map a Parquet metadata table and pull out the result field columns."""
+    table = pq.read_table(parquet_path, memory_map=True)
+    
+    fields = {}
+    for key in RESULT_FIELDS:
+        if key in table.column_names:
+            # Rows that lacked the key are nulls in the table
+            values = np.asarray(table.column(key).to_numpy(zero_copy_only=False), dtype=object)
+            values[values == None] = ""  # noqa: E711 (elementwise comparison)
+            fields[key] = values
+        else:
+            fields[key] = np.full(table.num_rows, "", dtype=object)
+    
+    return _ParquetMetadata(table), fields
+
 def load_index(index_path: str = "nail_art_index.faiss", 
-               metadata_path: str = "nail_art_metadata.pkl") -> None:
+               metadata_path: str = "nail_art_metadata.pkl",
+               mmap: bool = False) -> Tuple[Any, List[Dict[str, Any]]]:
     """
     Load FAISS index and metadata from disk.
     
     Args:
         index_path: Path to FAISS index file
-        metadata_path: Path to metadata pickle file
+        metadata_path: Path to metadata pickle file; a sibling `.parquet` table
+            written by the same build is memory-mapped instead when pyarrow is installed
+        mmap: Memory-map the index file instead of reading it into RAM
+        
+    Returns:
+        The loaded (index, metadata), also cached for vector_search
     """
-    global _index, _metadata
+    global _index, _metadata, _result_fields
     
     if not os.path.exists(index_path):
         raise FileNotFoundError(f"Index file not found: {index_path}")
@@ -26,13 +76,31 @@ def load_index(index_path: str = "nail_art_index.faiss",
         raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
     
     # Load index
-    _index = faiss.read_index(index_path)
-    
-    # Load metadata
-    with open(metadata_path, 'rb') as f:
-        _metadata = pickle.load(f)
+    _index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP if mmap else 0)
+    
+    # IVF indexes only scan `nprobe` of their lists per query
+    try:
+        faiss.ParameterSpace().set_index_parameter(_index, "nprobe", IVF_NPROBE)
+    except RuntimeError:
+        pass  # not an IVF index
+    
+    # Load metadata, preferring the Parquet table unless it predates the pickle
+    parquet_path = os.path.splitext(metadata_path)[0] + ".parquet"
+    if (pq is not None and os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(metadata_path)):
+        _metadata, _result_fields = _load_parquet_metadata(parquet_path)
+    else:
+        with open(metadata_path, 'rb') as f:
+            _metadata = pickle.load(f)
+        
+        _result_fields = {
+            key: np.array([meta.get(key, "") for meta in _metadata], dtype=object)
+            for key in RESULT_FIELDS
+        }
     
     print(f"Loaded index with {_index.ntotal} vectors and {len(_metadata)} metadata entries")
+    
+    return _index, _metadata
 
 def vector_search(query_vector: np.ndarray, top_k: int = 10) -> List[Dict[str, Any]]:
     """
@@ -56,47 +124,42 @@ def vector_search(query_vector: np.ndarray, top_k: int = 10) -> List[Dict[str, A
             # Return empty results if no index exists
             return []
     
-    # Ensure query vector is 2D and normalized
-    if query_vector.ndim == 1:
-        query_vector = query_vector.reshape(1, -1)
+    # 2D float32 copy (the caller's array is left untouched), normalized in
+    # place by FAISS for cosine similarity
+    query_vector = np.array(query_vector, dtype=np.float32, ndmin=2)
+    faiss.normalize_L2(query_vector)
     
-    # Normalize query vector for cosine similarity (if not already normalized)
-    query_norm = np.linalg.norm(query_vector)
-    if query_norm > 0:
-        query_vector = query_vector / query_norm
-    
-    # Search index using inner product (cosine similarity since vectors are normalized)
-    # Increase search to get more candidates for better ranking
-    search_k = min(top_k * 3, _index.ntotal)  # Get more candidates
+    # Search index using inner product (cosine similarity since vectors are normalized).
+    # FAISS returns hits best-first, so no re-sort is needed afterwards
+    search_k = min(top_k, _index.ntotal)
     scores, indices = _index.search(query_vector, search_k)
     
-    # Convert to results with better scoring
-    results = []
-    for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-        if idx < len(_metadata):
-            # Convert inner product score to cosine similarity (0-1 range)
-            # Since vectors are normalized, inner product = cosine similarity
-            cosine_score = max(0, min(1, (score + 1) / 2))  # Convert from [-1,1] to [0,1]
-            
-            # Boost exact matches (same image) to ensure they rank highest
-            # This is a heuristic to prioritize identical images
-            if cosine_score > 0.99:  # Very high similarity suggests exact match
-                cosine_score = min(1.0, cosine_score + 0.01)  # Boost slightly
-            
-            result = {
-                "local_path": _metadata[idx].get("local_path", ""),
-                "score": float(cosine_score),  # Now in 0-1 range where 1 = identical
-                "booking_link": _metadata[idx].get("booking_link", ""),
-                "title": _metadata[idx].get("title", ""),
-                "artist": _metadata[idx].get("artist", "")
-            }
-            results.append(result)
-    
-    # Sort by score in descending order to ensure highest scores come first
-    results.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Return only the top_k results
-    return results[:top_k]
+    # -1 marks a slot the index could not fill (e.g. HNSW on tiny indexes)
+    hits = indices[0]
+    valid = (hits >= 0) & (hits < len(_metadata))
+    hits = hits[valid]
+    
+    # Convert inner product scores to cosine similarity (0-1 range);
+    # fp16 storage can push them a hair outside [-1, 1], hence the clip
+    cosine_scores = np.clip((scores[0][valid] + 1) / 2, 0, 1)
+    
+    # Boost exact matches (same image) to ensure they rank highest.
+    # The boost is monotonic, so FAISS's ordering still holds
+    exact = cosine_scores > 0.99  # Very high similarity suggests exact match
+    cosine_scores[exact] = np.minimum(1.0, cosine_scores[exact] + 0.01)  # Boost slightly
+    
+    local_paths, booking_links, titles, artists = (_result_fields[key][hits] for key in RESULT_FIELDS)
+    return [
+        {
+            "local_path": local_path,
+            "score": score,  # Now in 0-1 range where 1 = identical
+            "booking_link": booking_link,
+            "title": title,
+            "artist": artist
+        }
+        for local_path, score, booking_link, title, artist
+        in zip(local_paths, cosine_scores.tolist(), booking_links, titles, artists)
+    ]
 
 def get_index_stats() -> Dict[str, Any]:
     """
@@ -114,13 +177,15 @@ def get_index_stats() -> Dict[str, Any]:
         "total_vectors": _index.ntotal,
         "dimension": _index.d,
         "metadata_count": len(_metadata) if _metadata else 0,
-        "index_type": type(_index).__name__
+        "index_type": type(_index).__name__,
+        "faiss_compile_options": faiss.get_compile_options()
     }
 
 def clear_cache() -> None:
     """
     Clear the cached index and metadata.
     """
-    global _index, _metadata
+    global _index, _metadata, _result_fields
     _index = None
-    _metadata = None 
\ No newline at end of file
+    _metadata = None
+    _result_fields = {} 
\ No newline at end of file
@@ -5,15 +5,25 @@ This will help us get 20 unique working images for the portfolios.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from typing import List, Dict, Any
-import time
+from concurrent.futures import ThreadPoolExecutor
 
-def test_supabase_image(filename: str) -> bool:
+# Concurrent HEAD checks; the bounded pool also keeps the load on Supabase modest
+MAX_WORKERS = 16
+
+# One keep-alive session for every check instead of a TCP+TLS handshake per URL
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * 2,
+                                       max_retries=Retry(total=1)))
+
+def test_supabase_image(filename: str, session: requests.Session = _session) -> bool:
     """Test if a Supabase image URL returns 200 OK."""
     url = f"https://yejyxznoddkegbqzpuex.supabase.co/storage/v1/object/public/nail-art-images/{filename}"
     try:
-        response = requests.head(url, timeout=10)
+        response = session.head(url, timeout=10)
         return response.status_code == 200
     except:
         return False
@@ -68,17 +78,18 @@ def main():
     potential_files = get_potential_filenames()
     working_files = []
     
-    for i, filename in enumerate(potential_files, 1):
+    # Check all URLs concurrently, then report in the original order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(test_supabase_image, potential_files))
+    
+    for i, (filename, works) in enumerate(zip(potential_files, results), 1):
         print(f"[{i:2d}/{len(potential_files)}] Testing {filename[:50]}...")
         
-        if test_supabase_image(filename):
+        if works:
             print(f"  ✅ WORKS: {filename}")
             working_files.append(filename)
         else:
             print(f"  ❌ Failed: {filename}")
-        
-        # Small delay to be nice to the server
-        time.sleep(0.2)
     
     print(f"\n🎉 Summary:")
     print(f"   Total tested: {len(potential_files)}")
@@ -5,13 +5,61 @@ This script extracts images from a ZIP file and adds them to your existing datas
 """
 
 import os
+import io
 import json
 import zipfile
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 from PIL import Image
 import random
 
+# ZIP members handed to each worker process at a time
+DECODE_CHUNKSIZE = 32
+
+# Per-process ZIP handle, opened once by the pool initializer
+_worker_zip = None
+
+def _open_worker_zip(zip_file_path):
+    """Open the ZIP once in each worker process instead of sharing a handle."""
+    global _worker_zip
+    _worker_zip = zipfile.ZipFile(zip_file_path, 'r')
+
+def _output_filenames(image_files):
+    """
+    Pick a unique JPEG filename per ZIP member.
+    
+    Members sharing a stem (a/x.jpg and b/x.png) would otherwise be written
+    to the same path by two workers at once; later ones get a numeric suffix.
+    """
+    filenames = []
+    used = set()
+    for image_file in image_files:
+        base_name = Path(image_file).stem
+        new_filename = f"{base_name}.jpg"
+        suffix = 1
+        while new_filename in used:
+            new_filename = f"{base_name}_{suffix}.jpg"
+            suffix += 1
+        used.add(new_filename)
+        filenames.append(new_filename)
+    return filenames
+
+def _decode_and_reencode(image_file: str, new_filename: str, images_dir: Path) -> Optional[str]:
+    """Re-encode one ZIP member as JPEG in images_dir; returns the new filename."""
+    try:
+        # Decode straight from the archive and save to nail_art_images
+        with Image.open(io.BytesIO(_worker_zip.read(image_file))) as img:
+            img = img.convert('RGB')
+            img.save(images_dir / new_filename, 'JPEG', quality=95)
+        
+        return new_filename
+        
+    except Exception as e:
+        print(f"⚠️  Could not process {image_file}: {e}")
+        return None
+
 def integrate_new_images(zip_file_path):
     """Integrate new images from ZIP with existing dataset."""
     
@@ -41,40 +89,19 @@ def integrate_new_images(zip_file_path):
     # Extract images from ZIP
     print(f"📦 Extracting images from: {zip_file_path}")
     
-    extracted_images = []
     with zipfile.ZipFile(zip_file_path, 'r') as zipf:
         # Get list of image files
         image_files = [f for f in zipf.namelist() if f.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp', '.gif'))]
-        
-        print(f"🖼️  Found {len(image_files)} images in ZIP")
-        
-        for image_file in image_files:
-            try:
-                # Extract image
-                zipf.extract(image_file, "temp_extract")
-                temp_path = Path("temp_extract") / image_file
-                
-                # Generate new filename
-                base_name = Path(image_file).stem
-                new_filename = f"{base_name}.jpg"
-                
-                # Convert to JPEG and save to nail_art_images
-                with Image.open(temp_path) as img:
-                    img = img.convert('RGB')
-                    output_path = images_dir / new_filename
-                    img.save(output_path, 'JPEG', quality=95)
-                
-                extracted_images.append(new_filename)
-                
-                # Clean up temp file
-                temp_path.unlink()
-                
-            except Exception as e:
-                print(f"⚠️  Could not process {image_file}: {e}")
     
-    # Clean up temp directory
-    if os.path.exists("temp_extract"):
-        shutil.rmtree("temp_extract")
+    print(f"🖼️  Found {len(image_files)} images in ZIP")
+    
+    # Decoding and JPEG re-encoding is CPU-bound, so spread it over one
+    # process per core; results come back in ZIP order
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_open_worker_zip,
+                             initargs=(zip_file_path,)) as pool:
+        results = pool.map(_decode_and_reencode, image_files, _output_filenames(image_files),
+                           [images_dir] * len(image_files), chunksize=DECODE_CHUNKSIZE)
+        extracted_images = [filename for filename in results if filename is not None]
     
     print(f"✅ Extracted {len(extracted_images)} images to {images_dir}")
     
@@ -5,6 +5,7 @@ Optimized for hundreds/thousands of nail art images.
 """
 
 import os
+import io
 import json
 import zipfile
 from pathlib import Path
@@ -12,35 +13,8 @@ from PIL import Image
 import shutil
 from tqdm import tqdm
 
-def prepare_large_colab_dataset():
-    """Prepare large nail art dataset for Google Colab training."""
-    
-    print("🎨 Preparing LARGE Nail Art Dataset for Google Colab Training")
-    print("=" * 70)
-    
-    # Look for ZIP files in the current directory
-    zip_files = [f for f in os.listdir('.') if f.endswith('.zip')]
-    
-    if not zip_files:
-        print("❌ No ZIP files found in current directory!")
-        print("💡 Please make sure your nail art ZIP file is in the current directory")
-        return
-    
-    print(f"📦 Found ZIP files: {zip_files}")
-    
-    # Use the first ZIP file found (or let user choose)
-    zip_file = zip_files[0]
-    print(f"🎯 Using ZIP file: {zip_file}")
-    
-    # Extract images from ZIP
-    print(f"📦 Extracting images from: {zip_file}")
-    
-    # Create temporary extraction directory
-    temp_dir = "temp_extract"
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-    os.makedirs(temp_dir)
-    
+def extract_zip_images(zip_file, output_dir):
+    """Decode the ZIP's images in memory and save them to output_dir as JPEG."""
     extracted_images = []
     with zipfile.ZipFile(zip_file, 'r') as zipf:
         # Get list of image files
@@ -48,24 +22,20 @@ def prepare_large_colab_dataset():
         
         if not image_files:
             print("❌ No image files found in ZIP!")
-            return
+            return extracted_images
         
         print(f"🖼️  Found {len(image_files)} images in ZIP")
         
         for image_file in image_files:
             try:
-                # Extract image
-                zipf.extract(image_file, temp_dir)
-                temp_path = os.path.join(temp_dir, image_file)
-                
                 # Generate new filename
                 base_name = Path(image_file).stem
                 new_filename = f"{base_name}.jpg"
                 
-                # Convert to JPEG and save to training directory
-                with Image.open(temp_path) as img:
+                # Convert to JPEG and save to the output directory
+                with Image.open(io.BytesIO(zipf.read(image_file))) as img:
                     img = img.convert('RGB')
-                    output_path = os.path.join(temp_dir, new_filename)
+                    output_path = output_dir / new_filename
                     img.save(output_path, 'JPEG', quality=95)
                 
                 extracted_images.append(new_filename)
@@ -75,9 +45,53 @@ def prepare_large_colab_dataset():
     
     if not extracted_images:
         print("❌ No images were successfully extracted!")
+    
+    return extracted_images
+
+def prepare_large_colab_dataset():
+    """Prepare large nail art dataset for Google Colab training."""
+    
+    print("🎨 Preparing LARGE Nail Art Dataset for Google Colab Training")
+    print("=" * 70)
+    
+    # Look for ZIP files in the current directory
+    zip_files = [f for f in os.listdir('.') if f.endswith('.zip')]
+    
+    if not zip_files:
+        print("❌ No ZIP files found in current directory!")
+        print("💡 Please make sure your nail art ZIP file is in the current directory")
         return
     
-    print(f"✅ Extracted {len(extracted_images)} images")
+    print(f"📦 Found ZIP files: {zip_files}")
+    
+    # Use the first ZIP file found (or let user choose)
+    zip_file = zip_files[0]
+    print(f"🎯 Using ZIP file: {zip_file}")
+    
+    # Extract images from ZIP
+    print(f"📦 Extracting images from: {zip_file}")
+    
+    # Decode into a staging directory and only replace the training
+    # directory once at least one image made it
+    training_dir = Path("colab_training_images_large")
+    staging_dir = training_dir.with_name(training_dir.name + ".partial")
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    staging_dir.mkdir()
+    
+    try:
+        extracted_images = extract_zip_images(zip_file, staging_dir)
+        if not extracted_images:
+            return
+        
+        if training_dir.exists():
+            shutil.rmtree(training_dir)  # Clean start
+        staging_dir.rename(training_dir)
+    finally:
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+    
+    print(f"✅ Extracted {len(extracted_images)} images to {training_dir}")
     
     # Ask user about dataset size
     if len(extracted_images) > 1000:
@@ -90,25 +104,6 @@ def prepare_large_colab_dataset():
         print(f"📝 Small dataset detected! ({len(extracted_images)} images)")
         print("💡 Consider collecting more images for better results.")
     
-    # Create training directory
-    training_dir = Path("colab_training_images_large")
-    if training_dir.exists():
-        shutil.rmtree(training_dir)  # Clean start
-    training_dir.mkdir(exist_ok=True)
-    
-    # Copy images to training directory
-    copied_count = 0
-    for filename in extracted_images:
-        try:
-            source_path = os.path.join(temp_dir, filename)
-            dest_path = training_dir / filename
-            shutil.copy2(source_path, dest_path)
-            copied_count += 1
-        except Exception as e:
-            print(f"⚠️  Could not copy {filename}: {e}")
-    
-    print(f"✅ Copied {copied_count} images to training directory")
-    
     # Create metadata for training
     training_metadata = []
     for filename in extracted_images:
@@ -175,10 +170,6 @@ def prepare_large_colab_dataset():
         print(f"  📦 Batch size: 4-8")
         print(f"  📈 Expected improvement: 10-20%")
     
-    # Clean up temp directory
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-    
     print(f"\n🎯 Ready for Google Colab!")
     print(f"📤 Upload this file to Colab: {zip_path}")
     print(f"📚 Use the GOOGLE_COLAB_GUIDE.md for training instructions")